@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 import openai
 from config import OPENAI_API_KEY, AGENT_CONFIGS
 
@@ -19,7 +19,7 @@ class BaseAgent(ABC):
         if OPENAI_API_KEY:
             self.client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
         else:
-            logger.warning(f"OpenAI API key not configured - {agent_type} agent will use mock responses")
+            logger.warning("OpenAI API key not configured - %s agent will use mock responses", agent_type)
             self.client = None
     
     @abstractmethod
@@ -39,26 +39,15 @@ class BaseAgent(ABC):
             return await self._generate_mock_response(user_message, context)
         
         try:
-            # Prepare conversation history
-            messages = [
-                {"role": "system", "content": self.get_system_prompt()},
-                {"role": "user", "content": self._format_user_message(user_message, context)}
-            ]
-            
-            # Add recent conversation history if available
-            if context.get("recent_conversation"):
-                for msg in context["recent_conversation"][-3:]:  # Last 3 messages
-                    messages.insert(-1, {
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
+            messages = self._build_messages(user_message, context)
             
             # Generate response
             response = await self.client.chat.completions.create(
                 model=self.config["model"],
                 messages=messages,
                 temperature=self.config["temperature"],
-                max_tokens=self.config["max_tokens"]
+                max_tokens=self.config["max_tokens"],
+                **self._cache_kwargs(context)
             )
             
             agent_response = response.choices[0].message.content
@@ -72,9 +61,61 @@ class BaseAgent(ABC):
             }
             
         except Exception as e:
-            logger.error(f"Error generating response for {self.agent_type}: {e}")
+            logger.error("Error generating response for %s: %s", self.agent_type, e)
             return await self._generate_mock_response(user_message, context)
     
+    async def stream_response(self, user_message: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream the AI response as text chunks; yields the mock response in one piece without an API key."""
+        if not self.client:
+            mock = await self._generate_mock_response(user_message, context)
+            yield mock["response"]
+            return
+        
+        streamed_any = False
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.config["model"],
+                messages=self._build_messages(user_message, context),
+                temperature=self.config["temperature"],
+                max_tokens=self.config["max_tokens"],
+                stream=True,
+                **self._cache_kwargs(context)
+            )
+            
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    streamed_any = True
+                    yield chunk.choices[0].delta.content
+                    
+        except Exception as e:
+            logger.error("Error streaming response for %s: %s", self.agent_type, e)
+            if not streamed_any:
+                mock = await self._generate_mock_response(user_message, context)
+                yield mock["response"]
+    
+    def _cache_kwargs(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Extra request arguments that route calls sharing a session to a warm prompt-prefix cache."""
+        if context.get("prompt_cache_key"):
+            return {"extra_body": {"prompt_cache_key": context["prompt_cache_key"]}}
+        return {}
+    
+    def _build_messages(self, user_message: str, context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Build the chat messages (system prompt, recent history, user message) for the API."""
+        messages = [
+            {"role": "system", "content": self.get_system_prompt()},
+            {"role": "user", "content": self._format_user_message(user_message, context)}
+        ]
+        
+        # Add recent conversation history if available
+        if context.get("recent_conversation"):
+            for msg in context["recent_conversation"][-3:]:  # Last 3 messages
+                messages.insert(-1, {
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+        
+        return messages
+    
     def _format_user_message(self, user_message: str, context: Dict[str, Any]) -> str:
         """Format user message with context for the AI."""
         formatted_message = f"Customer Message: {user_message}\n\n"
@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Union
 from datetime import datetime
 
 from agents.base_agent import BaseAgent
@@ -58,27 +58,20 @@ class Orchestrator(BaseAgent):
         Synthesize their responses into a single, coherent customer response.
         """
     
-    async def process_request(self, user_message: str, session_id: str) -> Dict[str, Any]:
+    async def process_request(self, user_message: str, session_id: str,
+                              prompt_cache_key: Optional[str] = None) -> Dict[str, Any]:
         """Process a customer request by coordinating specialist agents."""
         try:
             start_time = datetime.now()
             
-            # Ensure session exists and get context
-            session_id, session = memory.get_or_create_session(session_id)
-            context = memory.get_context_for_agents(session_id)
-            
-            # Create execution plan
-            logger.info(f"Creating plan for request: {user_message[:50]}...")
-            plan = await planner.create_plan(user_message, context)
-            
-            # Validate plan
-            is_valid, validation_issues = await planner.validate_plan(plan)
-            if not is_valid:
-                logger.warning(f"Plan validation failed: {validation_issues}")
+            session_id, context, plan, validation_issues = await self._prepare_plan(
+                user_message, session_id, prompt_cache_key
+            )
+            if validation_issues:
                 return await self._handle_invalid_plan(user_message, context, validation_issues)
             
             # Execute plan
-            logger.info(f"Executing plan {plan.plan_id} with {len(plan.steps)} steps in {plan.execution_mode.value} mode")
+            logger.info("Executing plan %s with %d steps in %s mode", plan.plan_id, len(plan.steps), plan.execution_mode.value)
             execution_results = await self._execute_plan(plan, user_message, context)
             
             # Synthesize final response
@@ -87,61 +80,113 @@ class Orchestrator(BaseAgent):
             )
             
             # Update memory
-            memory.add_message(
-                session_id, 
-                "user", 
-                user_message
-            )
-            memory.add_message(
-                session_id,
-                "assistant",
-                final_response["response"],
-                agent_used="orchestrator",
-                tools_used=final_response.get("tools_used", []),
-                plan_executed=final_response.get("plan_executed")
-            )
+            self._record_exchange(session_id, user_message, final_response)
             
             # Calculate execution time
             execution_time = (datetime.now() - start_time).total_seconds()
             final_response["execution_time"] = execution_time
             
-            logger.info(f"Request processed successfully in {execution_time:.2f}s")
+            logger.info("Request processed successfully in %.2fs", execution_time)
             return final_response
             
         except Exception as e:
-            logger.error(f"Error in orchestrator process_request: {e}")
+            logger.error("Error in orchestrator process_request: %s", e)
             return await self._handle_error(user_message, str(e))
     
+    async def stream_request(self, user_message: str, session_id: str,
+                             prompt_cache_key: Optional[str] = None) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+        """Stream the synthesized response as text chunks, then yield the full result dict last."""
+        try:
+            start_time = datetime.now()
+            
+            session_id, context, plan, validation_issues = await self._prepare_plan(
+                user_message, session_id, prompt_cache_key
+            )
+            if validation_issues:
+                result = await self._handle_invalid_plan(user_message, context, validation_issues)
+                yield result["response"]
+                yield result
+                return
+            
+            logger.info("Executing plan %s with %d steps in %s mode", plan.plan_id, len(plan.steps), plan.execution_mode.value)
+            execution_results = await self._execute_plan(plan, user_message, context)
+            
+            # Stream the synthesis step; the specialist agents above have already finished
+            synthesis_context = self._build_synthesis_context(user_message, execution_results, plan)
+            chunks = []
+            async for chunk in self.stream_response(
+                self._create_synthesis_prompt(synthesis_context),
+                {**context, "synthesis_context": synthesis_context}
+            ):
+                chunks.append(chunk)
+                yield chunk
+            
+            response_text = "".join(chunks)
+            final_response = self._compile_response(
+                {"response": response_text, "confidence": self._estimate_confidence(response_text)},
+                execution_results, plan
+            )
+            
+            self._record_exchange(session_id, user_message, final_response)
+            
+            execution_time = (datetime.now() - start_time).total_seconds()
+            final_response["execution_time"] = execution_time
+            
+            logger.info("Request streamed successfully in %.2fs", execution_time)
+            yield final_response
+            
+        except Exception as e:
+            logger.error("Error in orchestrator stream_request: %s", e)
+            result = await self._handle_error(user_message, str(e))
+            yield result["response"]
+            yield result
+    
+    async def _prepare_plan(self, user_message: str, session_id: str, prompt_cache_key: Optional[str] = None):
+        """Resolve the session, create a plan and validate it; returns (session_id, context, plan, issues)."""
+        # Ensure session exists and get context
+        session_id, session = memory.get_or_create_session(session_id)
+        context = memory.get_context_for_agents(session_id)
+        if prompt_cache_key:
+            # Copy so the memory's cached context is not modified; every agent call sees the key
+            context = {**context, "prompt_cache_key": prompt_cache_key}
+        
+        # Create execution plan
+        logger.info("Creating plan for request: %s...", user_message[:50])
+        plan = await planner.create_plan(user_message, context)
+        
+        # Validate plan
+        is_valid, validation_issues = await planner.validate_plan(plan)
+        if not is_valid:
+            logger.warning("Plan validation failed: %s", validation_issues)
+        
+        return session_id, context, plan, validation_issues
+    
+    def _record_exchange(self, session_id: str, user_message: str, final_response: Dict[str, Any]):
+        """Store the user message and the synthesized reply in session memory."""
+        memory.add_message(
+            session_id, 
+            "user", 
+            user_message
+        )
+        memory.add_message(
+            session_id,
+            "assistant",
+            final_response["response"],
+            agent_used="orchestrator",
+            tools_used=final_response.get("tools_used", []),
+            plan_executed=final_response.get("plan_executed")
+        )
+    
     async def _execute_plan(self, plan: ExecutionPlan, user_message: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Execute the plan and return results from all agents."""
         results = []
         
         if plan.execution_mode == ExecutionMode.PARALLEL:
-            # Execute all steps in parallel
-            tasks = []
-            for step in plan.steps:
-                if step.agent_type in self.agents:
-                    task = asyncio.create_task(
-                        self.agents[step.agent_type].process_request(user_message, context)
-                    )
-                    tasks.append((step, task))
-            
-            # Wait for all tasks to complete
-            for step, task in tasks:
-                try:
-                    step.status = "running"
-                    result = await task
-                    step.status = "completed"
-                    step.result = result
-                    results.append(result)
-                except Exception as e:
-                    step.status = "failed"
-                    logger.error(f"Step {step.agent_type} failed: {e}")
-                    results.append({
-                        "response": f"Error in {step.agent_type} agent",
-                        "agent_used": step.agent_type,
-                        "error": str(e)
-                    })
+            # Execute all steps concurrently
+            steps = [step for step in plan.steps if step.agent_type in self.agents]
+            results.extend(await asyncio.gather(
+                *(self._run_step(step, user_message, context) for step in steps)
+            ))
         
         elif plan.execution_mode == ExecutionMode.SEQUENTIAL:
             # Execute steps sequentially
@@ -149,96 +194,74 @@ class Orchestrator(BaseAgent):
             
             for step in plan.steps:
                 if step.agent_type in self.agents:
-                    try:
-                        step.status = "running"
-                        logger.info(f"Executing step: {step.agent_type}")
-                        
-                        result = await self.agents[step.agent_type].process_request(
-                            user_message, accumulated_context
-                        )
-                        
-                        step.status = "completed"
-                        step.result = result
-                        results.append(result)
-                        
-                        # Update context with results for next step
-                        if result.get("tool_results"):
-                            accumulated_context["previous_results"] = result["tool_results"]
-                        
-                    except Exception as e:
-                        step.status = "failed"
-                        logger.error(f"Step {step.agent_type} failed: {e}")
-                        results.append({
-                            "response": f"Error in {step.agent_type} agent",
-                            "agent_used": step.agent_type,
-                            "error": str(e)
-                        })
+                    result = await self._run_step(step, user_message, accumulated_context)
+                    results.append(result)
+                    
+                    # Update context with results for next step
+                    if result.get("tool_results"):
+                        accumulated_context["previous_results"] = result["tool_results"]
         
         elif plan.execution_mode == ExecutionMode.CONDITIONAL:
-            # Execute steps based on dependencies
+            # Execute steps in dependency waves; steps within a wave run concurrently
             completed_agents = set()
             accumulated_context = context.copy()
+            pending = list(plan.steps)
             
-            while len(completed_agents) < len(plan.steps):
-                progress_made = False
+            while pending:
+                wave = [step for step in pending
+                        if all(dep in completed_agents for dep in step.depends_on)]
+                if not wave:
+                    logger.error("No progress made in conditional execution - breaking loop")
+                    break
+                
+                runnable = [step for step in wave if step.agent_type in self.agents]
+                logger.info("Executing conditional wave: %s", [step.agent_type for step in runnable])
+                wave_results = await asyncio.gather(
+                    *(self._run_step(step, user_message, accumulated_context) for step in runnable)
+                )
                 
-                for step in plan.steps:
-                    if (step.agent_type not in completed_agents and 
-                        all(dep in completed_agents for dep in step.depends_on)):
+                for step, result in zip(runnable, wave_results):
+                    if step.status == "completed":
+                        results.append(result)
                         
-                        try:
-                            step.status = "running"
-                            logger.info(f"Executing conditional step: {step.agent_type}")
-                            
-                            result = await self.agents[step.agent_type].process_request(
-                                user_message, accumulated_context
-                            )
-                            
-                            step.status = "completed"
-                            step.result = result
-                            results.append(result)
-                            completed_agents.add(step.agent_type)
-                            progress_made = True
-                            
-                            # Update context
-                            if result.get("tool_results"):
-                                accumulated_context["previous_results"] = result["tool_results"]
-                            
-                        except Exception as e:
-                            step.status = "failed"
-                            logger.error(f"Conditional step {step.agent_type} failed: {e}")
-                            completed_agents.add(step.agent_type)  # Mark as completed to avoid infinite loop
-                            progress_made = True
+                        # Update context
+                        if result.get("tool_results"):
+                            accumulated_context["previous_results"] = result["tool_results"]
                 
-                if not progress_made:
-                    logger.error("No progress made in conditional execution - breaking loop")
-                    break
+                # Failed or unknown steps are marked done too, to avoid an infinite loop
+                completed_agents.update(step.agent_type for step in wave)
+                pending = [step for step in pending if step not in wave]
         
         plan.status = "completed"
         return results
     
+    async def _run_step(self, step, user_message: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one plan step on its agent, recording status and result on the step."""
+        try:
+            step.status = "running"
+            logger.info("Executing step: %s", step.agent_type)
+            
+            result = await self.agents[step.agent_type].process_request(user_message, context)
+            
+            step.status = "completed"
+            step.result = result
+            return result
+            
+        except Exception as e:
+            step.status = "failed"
+            logger.error("Step %s failed: %s", step.agent_type, e)
+            return {
+                "response": f"Error in {step.agent_type} agent",
+                "agent_used": step.agent_type,
+                "error": str(e)
+            }
+    
     async def _synthesize_response(self, user_message: str, agent_results: List[Dict[str, Any]], 
                                  plan: ExecutionPlan, context: Dict[str, Any]) -> Dict[str, Any]:
         """Synthesize responses from multiple agents into a coherent answer."""
         try:
             # Prepare synthesis context
-            synthesis_context = {
-                "user_request": user_message,
-                "agent_responses": [
-                    {
-                        "agent": result.get("agent_used", "unknown"),
-                        "response": result.get("response", ""),
-                        "confidence": result.get("confidence", 0.5),
-                        "tools_used": result.get("tools_used", [])
-                    }
-                    for result in agent_results if result.get("response")
-                ],
-                "plan_info": {
-                    "execution_mode": plan.execution_mode.value,
-                    "steps_completed": len([s for s in plan.steps if s.status == "completed"]),
-                    "total_steps": len(plan.steps)
-                }
-            }
+            synthesis_context = self._build_synthesis_context(user_message, agent_results, plan)
             
             # Generate synthesized response using AI
             synthesis_prompt = self._create_synthesis_prompt(synthesis_context)
@@ -247,42 +270,67 @@ class Orchestrator(BaseAgent):
                 {**context, "synthesis_context": synthesis_context}
             )
             
-            # Compile comprehensive response
-            all_tools_used = []
-            all_tool_results = []
-            
-            for result in agent_results:
-                all_tools_used.extend(result.get("tools_used", []))
-                all_tool_results.extend(result.get("tool_results", []))
-            
-            return {
-                "response": synthesis_response["response"],
-                "plan_executed": {
-                    "plan_id": plan.plan_id,
-                    "execution_mode": plan.execution_mode.value,
-                    "steps": [
-                        {
-                            "agent": step.agent_type,
-                            "status": step.status,
-                            "task": step.task_description
-                        }
-                        for step in plan.steps
-                    ],
-                    "agents_involved": list(set(result.get("agent_used") for result in agent_results if result.get("agent_used"))),
-                    "tools_used": list(set(all_tools_used)),
-                    "estimated_time": plan.estimated_time,
-                    "actual_steps": len(agent_results)
-                },
-                "thinking_process": f"Coordinated {len(agent_results)} specialist agents using {plan.execution_mode.value} execution",
-                "confidence": min(synthesis_response.get("confidence", 0.7), max(r.get("confidence", 0.5) for r in agent_results) if agent_results else 0.5),
-                "tools_used": list(set(all_tools_used)),
-                "tool_results": all_tool_results
-            }
+            return self._compile_response(synthesis_response, agent_results, plan)
             
         except Exception as e:
-            logger.error(f"Error synthesizing response: {e}")
+            logger.error("Error synthesizing response: %s", e)
             return await self._create_fallback_response(agent_results)
     
+    def _build_synthesis_context(self, user_message: str, agent_results: List[Dict[str, Any]], 
+                                 plan: ExecutionPlan) -> Dict[str, Any]:
+        """Collect the agent responses and plan summary used for synthesis."""
+        return {
+            "user_request": user_message,
+            "agent_responses": [
+                {
+                    "agent": result.get("agent_used", "unknown"),
+                    "response": result.get("response", ""),
+                    "confidence": result.get("confidence", 0.5),
+                    "tools_used": result.get("tools_used", [])
+                }
+                for result in agent_results if result.get("response")
+            ],
+            "plan_info": {
+                "execution_mode": plan.execution_mode.value,
+                "steps_completed": len([s for s in plan.steps if s.status == "completed"]),
+                "total_steps": len(plan.steps)
+            }
+        }
+    
+    def _compile_response(self, synthesis_response: Dict[str, Any], agent_results: List[Dict[str, Any]], 
+                          plan: ExecutionPlan) -> Dict[str, Any]:
+        """Compile the synthesized text, plan summary and tool results into the final response."""
+        all_tools_used = []
+        all_tool_results = []
+        
+        for result in agent_results:
+            all_tools_used.extend(result.get("tools_used", []))
+            all_tool_results.extend(result.get("tool_results", []))
+        
+        return {
+            "response": synthesis_response["response"],
+            "plan_executed": {
+                "plan_id": plan.plan_id,
+                "execution_mode": plan.execution_mode.value,
+                "steps": [
+                    {
+                        "agent": step.agent_type,
+                        "status": step.status,
+                        "task": step.task_description
+                    }
+                    for step in plan.steps
+                ],
+                "agents_involved": list(set(result.get("agent_used") for result in agent_results if result.get("agent_used"))),
+                "tools_used": list(set(all_tools_used)),
+                "estimated_time": plan.estimated_time,
+                "actual_steps": len(agent_results)
+            },
+            "thinking_process": f"Coordinated {len(agent_results)} specialist agents using {plan.execution_mode.value} execution",
+            "confidence": min(synthesis_response.get("confidence", 0.7), max(r.get("confidence", 0.5) for r in agent_results) if agent_results else 0.5),
+            "tools_used": list(set(all_tools_used)),
+            "tool_results": all_tool_results
+        }
+    
     def _create_synthesis_prompt(self, synthesis_context: Dict[str, Any]) -> str:
         """Create a prompt for synthesizing multiple agent responses."""
         prompt = f"Customer Request: {synthesis_context['user_request']}\n\n"
@@ -327,7 +375,7 @@ class Orchestrator(BaseAgent):
     async def _handle_invalid_plan(self, user_message: str, context: Dict[str, Any], 
                                  validation_issues: List[str]) -> Dict[str, Any]:
         """Handle cases where plan validation fails."""
-        logger.warning(f"Using fallback execution due to invalid plan: {validation_issues}")
+        logger.warning("Using fallback execution due to invalid plan: %s", validation_issues)
         
         # Try a simple single-agent approach
         try:
@@ -347,7 +395,7 @@ class Orchestrator(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Fallback execution also failed: {e}")
+            logger.error("Fallback execution also failed: %s", e)
             return await self._handle_error(user_message, str(e))
     
     async def _handle_error(self, user_message: str, error: str) -> Dict[str, Any]:
@@ -1,5 +1,6 @@
 """Solutions specialist agent for returns, exchanges, and problem resolution."""
 
+import asyncio
 import logging
 from typing import Dict, Any, List
 from agents.base_agent import BaseAgent
@@ -85,9 +86,17 @@ class SolutionsAgent(BaseAgent):
     async def _handle_return_request(self, message: str, context: Dict[str, Any], 
                                    tool_results: List[Dict], tools_used: List[str]):
         """Handle return requests."""
-        # Get return policy information
         return_reason = self._extract_return_reason(message)
-        return_guidelines = await knowledge_tools.get_return_guidelines(return_reason)
+        order_id = self._extract_order_id(message, context)
+        
+        # Policy lookup and return processing are independent, so run them together
+        if order_id:
+            return_guidelines, return_result = await asyncio.gather(
+                knowledge_tools.get_return_guidelines(return_reason),
+                order_tools.initiate_return(order_id, return_reason)
+            )
+        else:
+            return_guidelines = await knowledge_tools.get_return_guidelines(return_reason)
         
         tool_results.append({
             "tool": "get_return_guidelines",
@@ -95,10 +104,8 @@ class SolutionsAgent(BaseAgent):
         })
         tools_used.append("return_policy_lookup")
         
-        # If order ID is available, process the return
-        order_id = self._extract_order_id(message, context)
+        # If order ID is available, record the processed return
         if order_id:
-            return_result = await order_tools.initiate_return(order_id, return_reason)
             tool_results.append({
                 "tool": "initiate_return",
                 "result": return_result
@@ -108,8 +115,17 @@ class SolutionsAgent(BaseAgent):
     async def _handle_exchange_request(self, message: str, context: Dict[str, Any],
                                      tool_results: List[Dict], tools_used: List[str]):
         """Handle exchange requests."""
-        # Get exchange policy
-        exchange_policy = await knowledge_tools.get_policies("exchange")
+        order_id = self._extract_order_id(message, context)
+        
+        # Fetch the exchange policy and the order concurrently
+        if order_id:
+            exchange_policy, order_info = await asyncio.gather(
+                knowledge_tools.get_policies("exchange"),
+                order_tools.get_order_info(order_id)
+            )
+        else:
+            exchange_policy = await knowledge_tools.get_policies("exchange")
+        
         tool_results.append({
             "tool": "get_policies",
             "result": exchange_policy
@@ -117,9 +133,7 @@ class SolutionsAgent(BaseAgent):
         tools_used.append("exchange_policy_lookup")
         
         # Check order eligibility if order ID available
-        order_id = self._extract_order_id(message, context)
         if order_id:
-            order_info = await order_tools.get_order_info(order_id)
             if order_info:
                 tool_results.append({
                     "tool": "get_order_info",
@@ -141,9 +155,17 @@ class SolutionsAgent(BaseAgent):
     async def _handle_warranty_claim(self, message: str, context: Dict[str, Any],
                                    tool_results: List[Dict], tools_used: List[str]):
         """Handle warranty claims."""
-        # Get warranty coverage information
         warranty_type = self._extract_warranty_type(message, context)
-        warranty_coverage = await knowledge_tools.get_warranty_coverage(warranty_type)
+        order_id = self._extract_order_id(message, context)
+        
+        # Coverage details and the order's warranty status are independent lookups
+        if order_id:
+            warranty_coverage, warranty_status = await asyncio.gather(
+                knowledge_tools.get_warranty_coverage(warranty_type),
+                order_tools.check_warranty(order_id)
+            )
+        else:
+            warranty_coverage = await knowledge_tools.get_warranty_coverage(warranty_type)
         
         tool_results.append({
             "tool": "get_warranty_coverage",
@@ -152,9 +174,7 @@ class SolutionsAgent(BaseAgent):
         tools_used.append("warranty_policy_lookup")
         
         # Check warranty status if order ID available
-        order_id = self._extract_order_id(message, context)
         if order_id:
-            warranty_status = await order_tools.check_warranty(order_id)
             tool_results.append({
                 "tool": "check_warranty",
                 "result": warranty_status
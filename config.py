@@ -17,6 +17,12 @@ GEMINI_MODEL = "gemini-2.0-flash"
 REQUEST_TIMEOUT = 30  # seconds
 MAX_CONVERSATION_HISTORY = 20
 SESSION_TIMEOUT = 3600  # 1 hour
+MEMORY_DB_PATH = os.getenv("MEMORY_DB_PATH", "memory.db")  # SQLite file for session memory (":memory:" to disable)
+DATA_CLIENT_THREADS = int(os.getenv("DATA_CLIENT_THREADS", "0"))  # Worker threads for data lookups (0 = answer inline)
+ORDER_CACHE_TTL = 30  # seconds an order lookup stays cached
+REDIS_URL = os.getenv("REDIS_URL", "")  # Optional shared order cache across workers, e.g. redis://localhost:6379/0
+SEARCH_MAX_CONCURRENCY = 8  # Gemini search calls in flight at once, across concurrent searches
+SEARCH_CACHE_TTL = 300  # seconds a Gemini search result stays cached
 
 # Agent configurations
 AGENT_CONFIGS = {
@@ -48,5 +54,6 @@ AGENT_CONFIGS = {
 }
 
 # Logging configuration
-LOG_LEVEL = "INFO"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # Root level; DEBUG records are only built when a log file will take them
+LOG_QUEUE_SIZE = 10_000  # Log records buffered for the background writer before new ones are dropped
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""Read-only snapshot of the policy table, built once at import with its derived lookup keys."""
+
+from types import MappingProxyType
+from typing import Any, Mapping
+from data.mock_data import policies, get_policy
+
+# Policy fields only ever used for membership tests; stored as lowercased frozensets
+_MEMBERSHIP_FIELDS = ("free_return_reasons",)
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _coverage_by_period(coverage: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Index warranty coverage under every spelling of its period ("2_year", "2 year", "2 years")."""
+    index = {}
+    for key, items in coverage.items():
+        spaced = key.replace("_", " ")
+        for alias in (key, key + "s", spaced, spaced + "s"):
+            index[alias] = items
+    return MappingProxyType(index)
+
+def _freeze_policy(policy: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Build the frozen view of one policy, adding its derived lookup fields."""
+    frozen = {k: _freeze(v) for k, v in policy.items()}
+    for field in _MEMBERSHIP_FIELDS:
+        if field in frozen:
+            frozen[field] = frozenset(reason.lower() for reason in frozen[field])
+    
+    # Orders spell periods as "2 years" while the policy keys them "2_year"; resolve both up front
+    if "coverage" in frozen:
+        frozen["coverage_by_period"] = _coverage_by_period(frozen["coverage"])
+    return MappingProxyType(frozen)
+
+def build_policy_snapshot() -> Mapping[str, Mapping[str, Any]]:
+    """Freeze every known policy type into one read-only table."""
+    return MappingProxyType({
+        policy_type: _freeze_policy(get_policy(policy_type))
+        for policy_type in policies
+    })
+
+POLICY_SNAPSHOT = build_policy_snapshot()
+
+def refresh():
+    """Rebuild the snapshot after the underlying policies change."""
+    global POLICY_SNAPSHOT
+    POLICY_SNAPSHOT = build_policy_snapshot()
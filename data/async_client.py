@@ -0,0 +1,48 @@
+"""Awaitable access to the data store with optional thread offload and in-flight coalescing."""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from data.mock_data import get_order
+from config import DATA_CLIENT_THREADS
+
+logger = logging.getLogger(__name__)
+
+class AsyncDataClient:
+    """Async wrappers around the synchronous data accessors."""
+    
+    def __init__(self, threads: int = 0):
+        # threads=0 answers inline: the mock store is an in-process dict, so a thread hop only adds latency
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="data") if threads > 0 else None
+        self._in_flight: Dict[Tuple[Any, str, Hashable], asyncio.Future] = {}
+    
+    async def _call(self, fn: Callable[[Hashable], Any], key: Hashable) -> Any:
+        """Run a lookup, sharing one executor call between concurrent requests for the same key."""
+        if self._executor is None:
+            return fn(key)
+        
+        loop = asyncio.get_running_loop()
+        tag = (loop, fn.__name__, key)
+        
+        pending = self._in_flight.get(tag)
+        if pending is None:
+            pending = loop.run_in_executor(self._executor, fn, key)
+            self._in_flight[tag] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(tag, None))
+        
+        # Shield so one cancelled waiter doesn't cancel the lookup for everyone else
+        return await asyncio.shield(pending)
+    
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve order information by order ID."""
+        return await self._call(get_order, order_id)
+    
+    def close(self):
+        """Shut down the worker threads, if any."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            logger.info("Data client executor shut down")
+
+# Global data client instance
+data_client = AsyncDataClient(DATA_CLIENT_THREADS)
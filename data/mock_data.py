@@ -1,7 +1,10 @@
 """Mock data for the customer care system demo."""
 
+import re
+import string
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Set
 
 # Mock orders data
 orders: Dict[str, Dict[str, Any]] = {
@@ -198,6 +201,30 @@ policies: Dict[str, Dict[str, Any]] = {
     }
 }
 
+# Inverted index over knowledge base issue names: token -> positions in _KB_ISSUES
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TOKEN_CHARS = frozenset(string.ascii_lowercase + string.digits)  # the same ASCII class, for boundary checks
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase and split text into alphanumeric tokens (apostrophes dropped, so won't -> wont)."""
+    return _TOKEN_RE.findall(text.lower().replace("'", ""))
+
+_KB_ISSUES: List[str] = list(knowledge_base)
+_KB_INDEX: Dict[str, Set[int]] = {}
+for _idx, _issue in enumerate(_KB_ISSUES):
+    for _token in _tokenize(_issue):
+        _KB_INDEX.setdefault(_token, set()).add(_idx)
+
+# Optional Aho-Corasick automaton over the index tokens (pip install pyahocorasick)
+try:
+    import ahocorasick
+    _KB_AUTOMATON = ahocorasick.Automaton()
+    for _token in _KB_INDEX:
+        _KB_AUTOMATON.add_word(_token, _token)
+    _KB_AUTOMATON.make_automaton()
+except ImportError:
+    _KB_AUTOMATON = None
+
 def get_order(order_id: str) -> Dict[str, Any]:
     """Retrieve order information by order ID."""
     return orders.get(order_id)
@@ -206,20 +233,41 @@ def get_product(product_id: str) -> Dict[str, Any]:
     """Retrieve product information by product ID."""
     return products.get(product_id)
 
+def get_products_bulk(product_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Retrieve several products in one pass, keyed by ID; unknown IDs are left out."""
+    return {pid: product for pid in product_ids if (product := products.get(pid))}
+
 def get_all_products() -> Dict[str, Dict[str, Any]]:
     """Get all products."""
     return products
 
+def _query_tokens(query: str) -> Set[str]:
+    """Return the knowledge base tokens that occur as whole words in the query."""
+    if _KB_AUTOMATON is None:
+        return set(_tokenize(query))
+    
+    # One pass of the automaton over the query; keep only matches bounded like _TOKEN_RE tokens
+    text = query.lower().replace("'", "")
+    found = set()
+    for end, token in _KB_AUTOMATON.iter(text):
+        start = end - len(token) + 1
+        if ((start == 0 or text[start - 1] not in _TOKEN_CHARS)
+                and (end + 1 == len(text) or text[end + 1] not in _TOKEN_CHARS)):
+            found.add(token)
+    return found
+
 def search_knowledge_base(query: str) -> List[str]:
     """Search knowledge base for troubleshooting steps."""
-    query_lower = query.lower()
+    # Score each entry by how many of its issue tokens appear in the query; ties go to KB order
+    counts = Counter()
+    for token in _query_tokens(query):
+        counts.update(_KB_INDEX.get(token, ()))
     
-    # Simple keyword matching
-    for issue, steps in knowledge_base.items():
-        if any(keyword in query_lower for keyword in issue.split('_')):
-            return steps
+    if not counts:
+        return []
     
-    return []
+    best = min(counts, key=lambda idx: (-counts[idx], idx))
+    return knowledge_base[_KB_ISSUES[best]]
 
 def get_policy(policy_type: str) -> Dict[str, Any]:
     """Get company policy information."""
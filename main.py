@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import Optional
+from typing import Any, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 
 from agents.orchestrator import orchestrator
 from memory.session_memory import memory
+from data.async_client import data_client
 from utils.logging_config import setup_logging
 from utils.formatters import (
     format_chat_response, 
@@ -23,6 +24,18 @@ from utils.formatters import (
 )
 from config import REQUEST_TIMEOUT
 
+# Render responses with orjson when available: dates, numpy values and non-str keys are encoded in C
+try:
+    import orjson
+    
+    class FastJSONResponse(JSONResponse):
+        """JSONResponse rendered with orjson."""
+        
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+except ImportError:
+    FastJSONResponse = JSONResponse
+
 # Set up logging
 setup_logging()
 logger = logging.getLogger("main")
@@ -41,7 +54,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🔄 Multi-Agent Customer Care System shutting down...")
-    memory.clear_all_sessions()
+    memory.close()
+    data_client.close()
     logger.info("✅ Cleanup completed")
 
 # Create FastAPI app
@@ -49,7 +63,8 @@ app = FastAPI(
     title="Multi-Agent Customer Care System",
     description="A demonstration of coordinated AI agents providing comprehensive customer support",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -260,7 +275,7 @@ async def list_sessions():
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=404,
         content=format_error_response(
             "Endpoint not found",
@@ -270,7 +285,7 @@ async def not_found_handler(request, exc):
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content=format_error_response(
             "Internal server error",
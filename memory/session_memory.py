@@ -1,11 +1,63 @@
 """Session memory management for conversation context."""
 
 import uuid
+import sqlite3
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 import json
 
+from config import MEMORY_DB_PATH, SESSION_TIMEOUT
+
+# orjson is considerably faster for the plan/context payloads; fall back to the stdlib when absent
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+    
+    _loads = json.loads
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_activity REAL NOT NULL,
+    customer_context TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    agent_used TEXT,
+    tools_used TEXT,
+    plan_executed TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id);
+CREATE TABLE IF NOT EXISTS context_items (
+    session_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (session_id, kind, value)
+);
+"""
+
+# Context item kinds mapped to the Session list they populate
+_CONTEXT_KINDS = {
+    "order": "orders_discussed",
+    "issue": "issues_mentioned",
+    "product": "products_discussed"
+}
+
 @dataclass
 class Message:
     """Represents a single message in the conversation."""
@@ -28,13 +80,25 @@ class Session:
     issues_mentioned: List[str] = field(default_factory=list)
     orders_discussed: List[str] = field(default_factory=list)
     products_discussed: List[str] = field(default_factory=list)
+    context_log: List[Tuple[int, str, str]] = field(default_factory=list)  # (version, field, value)
 
 class SessionMemory:
-    """Manages conversation sessions and context."""
+    """Manages conversation sessions and context.
     
-    def __init__(self, session_timeout: int = 3600):
+    Sessions are persisted to SQLite with append-only writes; the in-RAM
+    ``sessions`` dict is a cache that is rehydrated from disk on a miss.
+    """
+    
+    def __init__(self, session_timeout: int = SESSION_TIMEOUT, db_path: str = MEMORY_DB_PATH):
         self.sessions: Dict[str, Session] = {}
         self.session_timeout = session_timeout
+        self._context_cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
     
     def create_session(self, session_id: Optional[str] = None) -> str:
         """Create a new session and return its ID."""
@@ -47,22 +111,37 @@ class SessionMemory:
             last_activity=datetime.now()
         )
         
-        self.sessions[session_id] = session
+        with self._lock:
+            # Reusing an ID starts over, so drop rows left by a previous session of that ID in the same transaction
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM context_items WHERE session_id = ?", (session_id,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, created_at, last_activity) VALUES (?, ?, ?)",
+                    (session_id, session.created_at.timestamp(), session.last_activity.timestamp())
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.sessions[session_id] = session
+            self._context_cache.pop(session_id, None)
         return session_id
     
     def get_session(self, session_id: str) -> Optional[Session]:
         """Get session by ID if it exists and is not expired."""
-        if session_id not in self.sessions:
-            return None
-        
-        session = self.sessions[session_id]
-        
-        # Check if session has expired
-        if datetime.now() - session.last_activity > timedelta(seconds=self.session_timeout):
-            del self.sessions[session_id]
-            return None
-        
-        return session
+        with self._lock:
+            session = self.sessions.get(session_id) or self._load_session(session_id)
+            if session is None:
+                return None
+            
+            # Check if session has expired
+            if datetime.now() - session.last_activity > timedelta(seconds=self.session_timeout):
+                self.clear_session(session_id)
+                return None
+            
+            return session
     
     def get_or_create_session(self, session_id: Optional[str] = None) -> tuple[str, Session]:
         """Get existing session or create new one."""
@@ -79,24 +158,48 @@ class SessionMemory:
                    agent_used: Optional[str] = None, tools_used: List[str] = None,
                    plan_executed: Optional[Dict[str, Any]] = None) -> None:
         """Add a message to the session."""
-        session = self.get_session(session_id)
-        if not session:
-            raise ValueError(f"Session {session_id} not found or expired")
-        
-        message = Message(
-            role=role,
-            content=content,
-            timestamp=datetime.now(),
-            agent_used=agent_used,
-            tools_used=tools_used or [],
-            plan_executed=plan_executed
-        )
-        
-        session.messages.append(message)
-        session.last_activity = datetime.now()
-        
-        # Update context based on message content
-        self._update_context(session, content)
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                raise ValueError(f"Session {session_id} not found or expired")
+            
+            message = Message(
+                role=role,
+                content=content,
+                timestamp=datetime.now(),
+                agent_used=agent_used,
+                tools_used=tools_used or [],
+                plan_executed=plan_executed
+            )
+            
+            session.messages.append(message)
+            session.last_activity = message.timestamp
+            
+            # Update context based on message content
+            new_items = self._update_context(session, content)
+            
+            # Append-only persistence: one message row plus any newly seen context items
+            ts = message.timestamp.timestamp()
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT INTO messages (session_id, ts, role, content, agent_used, tools_used, plan_executed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, ts, role, content, agent_used, _dumps(message.tools_used),
+                     _dumps(plan_executed) if plan_executed is not None else None)
+                )
+                if new_items:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO context_items (session_id, kind, value, ts) VALUES (?, ?, ?, ?)",
+                        [(session_id, kind, value, ts) for kind, value in new_items]
+                    )
+                self._conn.execute("UPDATE sessions SET last_activity = ? WHERE session_id = ?", (ts, session_id))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            
+            self._context_cache.pop(session_id, None)
     
     def get_conversation_history(self, session_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get conversation history for a session."""
@@ -108,76 +211,193 @@ class SessionMemory:
         if limit:
             messages = messages[-limit:]
         
-        return [
-            {
-                "role": msg.role,
-                "content": msg.content,
-                "timestamp": msg.timestamp.isoformat(),
-                "agent_used": msg.agent_used,
-                "tools_used": msg.tools_used,
-                "plan_executed": msg.plan_executed
-            }
-            for msg in messages
-        ]
+        return [self._message_dict(msg) for msg in messages]
     
-    def get_context_for_agents(self, session_id: str) -> Dict[str, Any]:
-        """Get relevant context for agents to use."""
+    def load_earlier(self, session_id: str, skip: int, limit: int) -> List[Dict[str, Any]]:
+        """Get up to ``limit`` messages preceding the newest ``skip`` ones, oldest first."""
         session = self.get_session(session_id)
         if not session:
-            return {}
-        
-        # Get recent conversation for context
-        recent_messages = session.messages[-5:] if len(session.messages) > 5 else session.messages
+            return []
         
-        return {
-            "session_id": session_id,
-            "customer_context": session.customer_context,
-            "preferences": session.preferences,
-            "issues_mentioned": session.issues_mentioned,
-            "orders_discussed": session.orders_discussed,
-            "products_discussed": session.products_discussed,
-            "recent_conversation": [
-                {"role": msg.role, "content": msg.content}
-                for msg in recent_messages
-            ],
-            "conversation_length": len(session.messages)
-        }
+        end = max(len(session.messages) - skip, 0)
+        start = max(end - limit, 0)
+        return [self._message_dict(msg) for msg in session.messages[start:end]]
+    
+    def get_context_for_agents(self, session_id: str) -> Dict[str, Any]:
+        """Get relevant context for agents to use (cached until the session is next written)."""
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return {}
+            
+            cached = self._context_cache.get(session_id)
+            if cached is not None:
+                return cached
+            
+            # Get recent conversation for context
+            recent_messages = session.messages[-5:] if len(session.messages) > 5 else session.messages
+            
+            context = {
+                "session_id": session_id,
+                "customer_context": session.customer_context,
+                "preferences": session.preferences,
+                "issues_mentioned": session.issues_mentioned,
+                "orders_discussed": session.orders_discussed,
+                "products_discussed": session.products_discussed,
+                "recent_conversation": [
+                    {"role": msg.role, "content": msg.content}
+                    for msg in recent_messages
+                ],
+                "conversation_length": len(session.messages)
+            }
+            self._context_cache[session_id] = context
+            return context
     
     def update_customer_context(self, session_id: str, context_updates: Dict[str, Any]) -> None:
         """Update customer context information."""
-        session = self.get_session(session_id)
-        if session:
-            session.customer_context.update(context_updates)
-            session.last_activity = datetime.now()
+        with self._lock:
+            session = self.get_session(session_id)
+            if session:
+                session.customer_context.update(context_updates)
+                session.last_activity = datetime.now()
+                self._conn.execute(
+                    "UPDATE sessions SET customer_context = ?, last_activity = ? WHERE session_id = ?",
+                    (_dumps(session.customer_context), session.last_activity.timestamp(), session_id)
+                )
+                self._context_cache.pop(session_id, None)
     
     def clear_session(self, session_id: str) -> bool:
         """Clear a specific session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            return True
-        return False
+        with self._lock:
+            self._context_cache.pop(session_id, None)
+            in_memory = self.sessions.pop(session_id, None) is not None
+            # One transaction, so a failure can't leave messages or context items without their session row
+            self._conn.execute("BEGIN")
+            try:
+                deleted = self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount
+                self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM context_items WHERE session_id = ?", (session_id,))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+            return in_memory or deleted > 0
     
     def clear_all_sessions(self) -> None:
         """Clear all sessions."""
-        self.sessions.clear()
+        with self._lock:
+            self.sessions.clear()
+            self._context_cache.clear()
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM sessions")
+                self._conn.execute("DELETE FROM messages")
+                self._conn.execute("DELETE FROM context_items")
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
     
     def get_all_session_ids(self) -> List[str]:
         """Get all active session IDs."""
-        current_time = datetime.now()
-        active_sessions = []
+        cutoff = (datetime.now() - timedelta(seconds=self.session_timeout)).timestamp()
         
-        for session_id, session in list(self.sessions.items()):
-            if current_time - session.last_activity <= timedelta(seconds=self.session_timeout):
-                active_sessions.append(session_id)
-            else:
-                # Clean up expired session
-                del self.sessions[session_id]
+        with self._lock:
+            # Clean up expired sessions
+            expired = [row[0] for row in self._conn.execute(
+                "SELECT session_id FROM sessions WHERE last_activity < ?", (cutoff,)
+            )]
+            for session_id in expired:
+                self.clear_session(session_id)
+            
+            return [row[0] for row in self._conn.execute("SELECT session_id FROM sessions")]
+    
+    def version(self, session_id: str) -> int:
+        """Return the session's context version (advances with every stored message)."""
+        session = self.get_session(session_id)
+        return len(session.messages) if session else 0
+    
+    def diff_since(self, session_id: str, version: int) -> Dict[str, Any]:
+        """Return the context items added after ``version`` plus the current conversation length."""
+        with self._lock:
+            session = self.get_session(session_id)
+            if not session:
+                return {}
+            
+            delta: Dict[str, Any] = {name: [] for name in _CONTEXT_KINDS.values()}
+            for item_version, name, value in reversed(session.context_log):
+                if item_version <= version:
+                    break
+                delta[name].append(value)
+            
+            for values in delta.values():
+                values.reverse()
+            delta["conversation_length"] = len(session.messages)
+            return delta
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def _message_dict(msg: Message) -> Dict[str, Any]:
+        """Convert a Message into the dict shape used by the history APIs."""
+        return {
+            "role": msg.role,
+            "content": msg.content,
+            "timestamp": msg.timestamp.isoformat(),
+            "agent_used": msg.agent_used,
+            "tools_used": msg.tools_used,
+            "plan_executed": msg.plan_executed
+        }
+    
+    def _load_session(self, session_id: str) -> Optional[Session]:
+        """Rehydrate a persisted session into the in-RAM cache."""
+        row = self._conn.execute(
+            "SELECT created_at, last_activity, customer_context FROM sessions WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
         
-        return active_sessions
+        session = Session(
+            session_id=session_id,
+            created_at=datetime.fromtimestamp(row[0]),
+            last_activity=datetime.fromtimestamp(row[1]),
+            customer_context=_loads(row[2])
+        )
+        
+        version_at = {}
+        for ts, role, content, agent_used, tools_used, plan_executed in self._conn.execute(
+            "SELECT ts, role, content, agent_used, tools_used, plan_executed FROM messages "
+            "WHERE session_id = ? ORDER BY id", (session_id,)
+        ):
+            version_at[ts] = len(session.messages) + 1
+            session.messages.append(Message(
+                role=role,
+                content=content,
+                timestamp=datetime.fromtimestamp(ts),
+                agent_used=agent_used,
+                tools_used=_loads(tools_used) if tools_used else [],
+                plan_executed=_loads(plan_executed) if plan_executed else None
+            ))
+        
+        for ts, kind, value in self._conn.execute(
+            "SELECT ts, kind, value FROM context_items WHERE session_id = ? ORDER BY ts, rowid", (session_id,)
+        ):
+            name = _CONTEXT_KINDS[kind]
+            getattr(session, name).append(value)
+            session.context_log.append((version_at.get(ts, len(session.messages)), name, value))
+        
+        self.sessions[session_id] = session
+        return session
     
-    def _update_context(self, session: Session, content: str) -> None:
-        """Update session context based on message content."""
+    def _update_context(self, session: Session, content: str) -> List[Tuple[str, str]]:
+        """Update session context based on message content; returns the newly added (kind, value) items."""
         content_lower = content.lower()
+        new_items = []
+        version = len(session.messages)
         
         # Extract order numbers
         import re
@@ -186,6 +406,8 @@ class SessionMemory:
         for order_id in order_matches:
             if order_id not in session.orders_discussed:
                 session.orders_discussed.append(order_id)
+                new_items.append(("order", order_id))
+                session.context_log.append((version, "orders_discussed", order_id))
         
         # Extract common issues
         issues = [
@@ -195,12 +417,18 @@ class SessionMemory:
         for issue in issues:
             if issue in content_lower and issue not in session.issues_mentioned:
                 session.issues_mentioned.append(issue)
+                new_items.append(("issue", issue))
+                session.context_log.append((version, "issues_mentioned", issue))
         
         # Extract product mentions
         products = ["techbook", "laptop", "computer", "pro 15", "air 13", "gaming 17"]
         for product in products:
             if product in content_lower and product not in session.products_discussed:
                 session.products_discussed.append(product)
+                new_items.append(("product", product))
+                session.context_log.append((version, "products_discussed", product))
+        
+        return new_items
 
 # Global memory instance
 memory = SessionMemory()
\ No newline at end of file
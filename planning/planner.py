@@ -66,6 +66,10 @@ class Planner:
                 "priority": 3
             }
         }
+        
+        # Precomputed lookups so hot paths avoid repeated nested dict access
+        self._priority_of = {a: c["priority"] for a, c in self.agent_capabilities.items()}
+        self._tools_of = {a: tuple(c.get("tools", ())) for a, c in self.agent_capabilities.items()}
     
     async def create_plan(self, user_request: str, context: Dict[str, Any]) -> ExecutionPlan:
         """Create an execution plan for the user request."""
@@ -97,11 +101,11 @@ class Planner:
             plan.confidence = self._estimate_plan_confidence(plan.steps, context)
             plan.status = "ready"
             
-            logger.info(f"Created plan {plan_id} with {len(plan.steps)} steps, mode: {plan.execution_mode.value}")
+            logger.info("Created plan %s with %d steps, mode: %s", plan_id, len(plan.steps), plan.execution_mode.value)
             return plan
             
         except Exception as e:
-            logger.error(f"Error creating plan: {e}")
+            logger.error("Error creating plan: %s", e)
             # Return a fallback plan
             return self._create_fallback_plan(user_request)
     
@@ -125,13 +129,13 @@ class Planner:
         
         # Validate tool requirements
         for step in plan.steps:
-            available_tools = self.agent_capabilities.get(step.agent_type, {}).get("tools", [])
+            available_tools = self._tools_of.get(step.agent_type, ())
             for tool in step.tools_required:
                 if tool not in available_tools:
                     issues.append(f"Agent {step.agent_type} requires unavailable tool: {tool}")
         
         is_valid = len(issues) == 0
-        logger.info(f"Plan validation: {'PASSED' if is_valid else 'FAILED'} with {len(issues)} issues")
+        logger.info("Plan validation: %s with %d issues", "PASSED" if is_valid else "FAILED", len(issues))
         
         return is_valid, issues
     
@@ -169,20 +173,19 @@ class Planner:
             required_agents.append(best_agent)
         
         # Sort by priority
-        required_agents.sort(key=lambda x: self.agent_capabilities[x]["priority"])
+        required_agents.sort(key=self._priority_of.__getitem__)
         
-        logger.info(f"Request analysis selected agents: {required_agents}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Request analysis selected agents: %s", required_agents)
         return required_agents
     
     def _create_step(self, agent_type: str, request: str, priority: int = 1) -> PlanStep:
         """Create a plan step for an agent."""
-        capabilities = self.agent_capabilities.get(agent_type, {})
-        
         return PlanStep(
             agent_type=agent_type,
             task_description=f"Process {agent_type} aspects of: {request}",
             priority=priority,
-            tools_required=capabilities.get("tools", [])
+            tools_required=list(self._tools_of.get(agent_type, ()))
         )
     
     async def _create_complex_plan(self, request: str, agents: List[str], context: Dict[str, Any]) -> List[PlanStep]:
@@ -7,22 +7,23 @@ Provides easy access to both Streamlit and FastAPI interfaces.
 import subprocess
 import sys
 import os
+import signal
+import socket
 import webbrowser
 import time
+from importlib.util import find_spec
 from pathlib import Path
 
 def check_dependencies():
-    """Check if all dependencies are installed."""
-    try:
-        import streamlit
-        import fastapi
-        import openai
-        print("✅ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    """Check if all dependencies are installed (without importing them)."""
+    missing = [m for m in ("streamlit", "fastapi", "openai") if find_spec(m) is None]
+    if missing:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    
+    print("✅ All dependencies are installed")
+    return True
 
 def start_streamlit_demo():
     """Start the Streamlit demo interface."""
@@ -31,15 +32,14 @@ def start_streamlit_demo():
     print("🤖 Features: Interactive chat, agent visualization, memory tracking")
     print()
     
-    try:
-        # Start Streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", "streamlit_app.py",
-            "--server.port", "8501",
-            "--server.address", "localhost"
-        ])
-    except KeyboardInterrupt:
-        print("\n🔄 Streamlit demo stopped")
+    sys.stdout.flush()
+    
+    # Replace this process with Streamlit - no second interpreter waiting on a child
+    os.execvp(sys.executable, [
+        sys.executable, "-m", "streamlit", "run", "streamlit_app.py",
+        "--server.port", "8501",
+        "--server.address", "localhost"
+    ])
 
 def start_fastapi_server():
     """Start the FastAPI server."""
@@ -49,11 +49,61 @@ def start_fastapi_server():
     print("🔧 Features: REST API, programmatic access")
     print()
     
+    sys.stdout.flush()
+    
+    # Replace this process with the FastAPI server
+    os.execvp(sys.executable, [sys.executable, "main.py"])
+
+def _popen_group(args):
+    """Launch a child in its own process group so its whole subtree can be stopped at once."""
+    if os.name == "nt":
+        return subprocess.Popen(args, close_fds=True,
+                                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+    return subprocess.Popen(args, close_fds=True, start_new_session=True)
+
+def _stop_process_group(process, timeout=5):
+    """Terminate a child and any grandchildren it spawned, escalating to SIGKILL."""
+    if process is None or process.poll() is not None:
+        return
+    
     try:
-        # Start FastAPI
-        subprocess.run([sys.executable, "main.py"])
-    except KeyboardInterrupt:
-        print("\n🔄 FastAPI server stopped")
+        if os.name == "nt":
+            process.terminate()
+        else:
+            os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(os.getpgid(process.pid), signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+def _wait_port(port, timeout=15):
+    """Poll until something is listening on localhost:port; False on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def _wait_for_shutdown(process):
+    """Block until SIGINT/SIGTERM is received, or until the child exits on Windows."""
+    shutdown_signals = {signal.SIGINT, signal.SIGTERM}
+    try:
+        signal.pthread_sigmask(signal.SIG_BLOCK, shutdown_signals)
+        try:
+            signal.sigwait(shutdown_signals)
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, shutdown_signals)
+    except AttributeError:
+        # Windows has no sigwait; Ctrl+C still raises KeyboardInterrupt here
+        process.wait()
 
 def start_both():
     """Start both interfaces simultaneously."""
@@ -65,34 +115,36 @@ def start_both():
     print("Press Ctrl+C to stop all services")
     print()
     
+    fastapi_process = None
+    streamlit_process = None
+    
     try:
-        # Start both in background
-        fastapi_process = subprocess.Popen([sys.executable, "main.py"])
-        streamlit_process = subprocess.Popen([
+        # Start both in background, each in its own process group
+        fastapi_process = _popen_group([sys.executable, "main.py"])
+        streamlit_process = _popen_group([
             sys.executable, "-m", "streamlit", "run", "streamlit_app.py",
             "--server.port", "8501",
             "--server.address", "localhost",
             "--server.headless", "true"
         ])
         
-        # Wait a moment for services to start
-        time.sleep(3)
-        
-        # Open Streamlit in browser
+        # Open Streamlit in browser as soon as it is accepting connections
+        if not _wait_port(8501):
+            print("⚠️  Streamlit did not open port 8501 in time, opening browser anyway")
         webbrowser.open("http://localhost:8501")
         
-        # Wait for user to stop
-        input("Press Enter to stop all services...")
+        # Block until Ctrl+C / SIGTERM arrives (no stdin dependency)
+        _wait_for_shutdown(streamlit_process)
         
     except KeyboardInterrupt:
         pass
     finally:
         print("🔄 Stopping services...")
-        try:
-            fastapi_process.terminate()
-            streamlit_process.terminate()
-        except:
-            pass
+        for process in (streamlit_process, fastapi_process):
+            try:
+                _stop_process_group(process)
+            except OSError:
+                pass
         print("✅ All services stopped")
 
 def show_help():
@@ -5,20 +5,55 @@ A beautiful, interactive chat interface showcasing coordinated AI agents.
 
 import streamlit as st
 import asyncio
+import hashlib
+import io
+import threading
 import time
 import json
-from datetime import datetime
-from typing import Dict, Any, List
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
 import sys
-import os
 
 # Add current directory to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = Path(__file__).resolve().parent
+sys.path.append(str(APP_DIR))
 
-from agents.orchestrator import orchestrator
-from memory.session_memory import memory
 from config import REQUEST_TIMEOUT
 
+# Only the most recent messages are kept in session state; older ones are paged in from memory
+MAX_VISIBLE_MESSAGES = 50
+EARLIER_PAGE_SIZE = 20
+
+# Memory context categories shown in the sidebar (each capped to its last 3 items)
+MEMORY_CATEGORIES = ("orders_discussed", "products_discussed", "issues_mentioned")
+
+@st.cache_resource
+def get_orchestrator():
+    """Import the orchestrator singleton once per server process, not once per rerun."""
+    from agents.orchestrator import orchestrator
+    return orchestrator
+
+@st.cache_resource
+def get_memory():
+    """Import the session memory singleton once per server process."""
+    from memory.session_memory import memory
+    return memory
+
+@st.cache_resource
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Start one long-lived event loop in a daemon thread, shared across reruns."""
+    try:
+        import uvloop
+        loop = uvloop.new_event_loop()
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    
+    thread = threading.Thread(target=loop.run_forever, name="agent-event-loop", daemon=True)
+    thread.start()
+    return loop
+
 # Page configuration
 st.set_page_config(
     page_title="Multi-Agent Customer Care Demo",
@@ -27,94 +62,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for beautiful styling
-st.markdown("""
-<style>
-    .main-header {
-        text-align: center;
-        padding: 1rem 0;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    
-    .agent-badge {
-        display: inline-block;
-        padding: 4px 12px;
-        margin: 2px;
-        border-radius: 20px;
-        font-size: 12px;
-        font-weight: bold;
-        color: white;
-    }
-    
-    .agent-order { background-color: #4CAF50; }
-    .agent-tech { background-color: #2196F3; }
-    .agent-product { background-color: #FF9800; }
-    .agent-solutions { background-color: #9C27B0; }
-    .agent-orchestrator { background-color: #607D8B; }
-    
-    .execution-step {
-        padding: 10px;
-        margin: 5px 0;
-        border-left: 4px solid #667eea;
-        background-color: #f8f9fa;
-        border-radius: 5px;
-    }
-    
-    .memory-item {
-        background-color: #e8f4fd;
-        padding: 8px;
-        margin: 4px 0;
-        border-radius: 5px;
-        font-size: 14px;
-    }
-    
-    .chat-message {
-        padding: 1rem;
-        margin: 0.5rem 0;
-        border-radius: 10px;
-    }
-    
-    .user-message {
-        background-color: #e3f2fd;
-        margin-left: 20%;
-    }
-    
-    .assistant-message {
-        background-color: #f1f8e9;
-        margin-right: 20%;
-    }
-    
-    .agent-activity {
-        background-color: #fff3e0;
-        border: 1px solid #ffcc02;
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-    }
-    
-    .status-executing { 
-        background-color: #ffc107; 
-        animation: pulse 1.5s infinite;
-    }
-    
-    .status-completed { background-color: #28a745; }
-    .status-pending { background-color: #6c757d; }
-    
-    @keyframes pulse {
-        0% { opacity: 1; }
-        50% { opacity: 0.5; }
-        100% { opacity: 1; }
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for beautiful styling, read from disk once per server process
+@st.cache_data
+def load_css() -> str:
+    """Load the app stylesheet wrapped in a <style> tag."""
+    return f"<style>\n{(APP_DIR / 'styles.css').read_text(encoding='utf-8')}</style>"
+
+st.markdown(load_css(), unsafe_allow_html=True)
 
 def initialize_session_state():
     """Initialize Streamlit session state variables."""
     if "messages" not in st.session_state:
-        st.session_state.messages = []
+        st.session_state.messages = deque(maxlen=MAX_VISIBLE_MESSAGES)
     
     if "session_id" not in st.session_state:
         st.session_state.session_id = f"streamlit-{int(time.time())}"
@@ -127,102 +86,218 @@ def initialize_session_state():
     
     if "execution_plan" not in st.session_state:
         st.session_state.execution_plan = None
+    
+    if "prompt_cache_key" not in st.session_state:
+        # Stable per-session hint so every agent call of this conversation hits the same prefix cache
+        st.session_state.prompt_cache_key = hashlib.blake2b(
+            st.session_state.session_id.encode(), digest_size=8
+        ).hexdigest()
+    
+    if "_turn" not in st.session_state:
+        st.session_state._turn = 0
+    
+    if "_bg_loop" not in st.session_state:
+        st.session_state._bg_loop = get_background_loop()
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>🤖 Multi-Agent Customer Care System</h1>
+    <p>Watch AI agents collaborate to solve customer problems</p>
+</div>
+"""
 
 def display_header():
     """Display the main header."""
-    st.markdown("""
-    <div class="main-header">
-        <h1>🤖 Multi-Agent Customer Care System</h1>
-        <p>Watch AI agents collaborate to solve customer problems</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
+@lru_cache(maxsize=128)
 def get_agent_badge_html(agent_type: str, status: str = "active") -> str:
     """Generate HTML for agent badge."""
     status_class = f"status-{status}" if status != "active" else ""
     return f'<span class="agent-badge agent-{agent_type} {status_class}">🤖 {agent_type.title()}</span>'
 
+@lru_cache(maxsize=256)
+def _activity_row_html(agent: str, status: str, action: str) -> str:
+    """Generate HTML for one agent activity row (badge, action caption, separator)."""
+    return (f'{get_agent_badge_html(agent, status)}<br>'
+            f'<small><em>{action}</em></small><hr style="margin: 0.5rem 0;">')
+
+def cached_panel_html(name: str, signature: Any, build) -> str:
+    """Return a panel's HTML, rebuilding it only when its signature changes."""
+    cache = st.session_state.setdefault("_panel_html", {})
+    hit = cache.get(name)
+    if hit is not None and hit[0] == signature:
+        return hit[1]
+    
+    html = build()
+    cache[name] = (signature, html)
+    return html
+
+def _build_activity_html() -> str:
+    """Build all activity rows into one string so the panel is a single markdown element."""
+    buf = io.StringIO()
+    for activity in st.session_state.agent_activity[-5:]:  # Show last 5 activities
+        buf.write(_activity_row_html(
+            activity.get("agent", "unknown"),
+            activity.get("status", "active"),
+            activity.get("action", "Processing...")
+        ))
+    return buf.getvalue()
+
 def display_agent_activity():
     """Display current agent activity in sidebar."""
-    st.sidebar.markdown("### 🔄 Agent Activity")
+    st.markdown("### 🔄 Agent Activity")
     
     if st.session_state.agent_activity:
-        for activity in st.session_state.agent_activity[-5:]:  # Show last 5 activities
-            agent = activity.get("agent", "unknown")
-            status = activity.get("status", "active")
-            action = activity.get("action", "Processing...")
-            
-            badge_html = get_agent_badge_html(agent, status)
-            st.sidebar.markdown(f"{badge_html}", unsafe_allow_html=True)
-            st.sidebar.caption(f"_{action}_")
-            st.sidebar.markdown("---")
+        html = cached_panel_html("activity", st.session_state._turn, _build_activity_html)
+        st.markdown(html, unsafe_allow_html=True)
     else:
-        st.sidebar.info("No agent activity yet. Send a message to see agents in action!")
+        st.info("No agent activity yet. Send a message to see agents in action!")
+
+def _build_memory_html() -> str:
+    """Build the memory context lists (orders, products, issues) as one HTML string."""
+    context = st.session_state.memory_context
+    buf = io.StringIO()
+    
+    # Orders discussed
+    if context.get("orders_discussed"):
+        buf.write("<p><strong>Orders Discussed:</strong></p>")
+        for order_id in context["orders_discussed"]:
+            buf.write(f'<div class="memory-item">📦 Order #{order_id}</div>')
+    
+    # Products discussed
+    if context.get("products_discussed"):
+        buf.write("<p><strong>Products Mentioned:</strong></p>")
+        for product in context["products_discussed"]:
+            buf.write(f'<div class="memory-item">💻 {product}</div>')
+    
+    # Issues mentioned
+    if context.get("issues_mentioned"):
+        buf.write("<p><strong>Issues Identified:</strong></p>")
+        for issue in context["issues_mentioned"]:
+            buf.write(f'<div class="memory-item">⚠️ {issue}</div>')
+    
+    return buf.getvalue()
 
 def display_memory_context():
     """Display current memory context in sidebar."""
-    st.sidebar.markdown("### 🧠 Memory Context")
+    st.markdown("### 🧠 Memory Context")
     
     if st.session_state.memory_context:
         context = st.session_state.memory_context
         
-        # Orders discussed
-        if context.get("orders_discussed"):
-            st.sidebar.markdown("**Orders Discussed:**")
-            for order_id in context["orders_discussed"][-3:]:
-                st.sidebar.markdown(f'<div class="memory-item">📦 Order #{order_id}</div>', 
-                                  unsafe_allow_html=True)
-        
-        # Products discussed
-        if context.get("products_discussed"):
-            st.sidebar.markdown("**Products Mentioned:**")
-            for product in context["products_discussed"][-3:]:
-                st.sidebar.markdown(f'<div class="memory-item">💻 {product}</div>', 
-                                  unsafe_allow_html=True)
-        
-        # Issues mentioned
-        if context.get("issues_mentioned"):
-            st.sidebar.markdown("**Issues Identified:**")
-            for issue in context["issues_mentioned"][-3:]:
-                st.sidebar.markdown(f'<div class="memory-item">⚠️ {issue}</div>', 
-                                  unsafe_allow_html=True)
+        html = cached_panel_html("memory", st.session_state.get("_mem_v", 0), _build_memory_html)
+        if html:
+            st.markdown(html, unsafe_allow_html=True)
         
         # Conversation length
         conv_length = context.get("conversation_length", 0)
-        st.sidebar.metric("Conversation Length", f"{conv_length} messages")
+        st.metric("Conversation Length", f"{conv_length} messages")
         
     else:
-        st.sidebar.info("Memory context will appear as you chat")
+        st.info("Memory context will appear as you chat")
+
+@st.fragment
+def render_sidebar():
+    """Render the agent activity and memory panels; call inside ``with st.sidebar``."""
+    display_agent_activity()
+    display_memory_context()
+
+def _build_plan_html() -> str:
+    """Build the execution plan summary and steps as one HTML string."""
+    plan = st.session_state.execution_plan
+    buf = io.StringIO()
+    buf.write("<h3>📋 Execution Plan</h3>")
+    buf.write(f"<p><strong>Plan ID:</strong> <code>{plan.get('plan_id', 'N/A')}</code><br>")
+    buf.write(f"<strong>Execution Mode:</strong> <code>{plan.get('execution_mode', 'unknown')}</code></p>")
+    
+    if plan.get("steps"):
+        buf.write("<p><strong>Agent Coordination Steps:</strong></p>")
+        for i, step in enumerate(plan["steps"], 1):
+            agent = step.get("agent", "unknown")
+            status = step.get("status", "pending")
+            task = step.get("task", "Processing...")
+            
+            badge_html = get_agent_badge_html(agent, status)
+            buf.write(f'<div class="execution-step"><strong>Step {i}:</strong> {badge_html}<br>'
+                      f'<em>{task}</em></div>')
+    
+    return buf.getvalue()
 
 def display_execution_plan():
     """Display the current execution plan."""
     if st.session_state.execution_plan:
-        plan = st.session_state.execution_plan
+        html = cached_panel_html("plan", st.session_state._turn, _build_plan_html)
+        st.markdown(html, unsafe_allow_html=True)
+
+async def _coalesce(agen, min_ms: float = 50, min_chars: int = 16):
+    """Batch streamed text into chunks of at least min_chars or min_ms; non-text items pass through."""
+    buf = ""
+    last = time.monotonic()
+    async for item in agen:
+        if not isinstance(item, str):
+            if buf:
+                yield buf
+                buf = ""
+            yield item
+            continue
         
-        st.markdown("### 📋 Execution Plan")
-        st.markdown(f"**Plan ID:** `{plan.get('plan_id', 'N/A')}`")
-        st.markdown(f"**Execution Mode:** `{plan.get('execution_mode', 'unknown')}`")
+        buf += item
+        now = time.monotonic()
+        if len(buf) >= min_chars or (now - last) * 1000 >= min_ms:
+            yield buf
+            buf = ""
+            last = now
+    
+    if buf:
+        yield buf
+
+def _sync_iter(agen, sink: Dict[str, Any]):
+    """Bridge an async generator on the background loop to a sync iterator of text chunks.
+    
+    Non-text items (the orchestrator's final result dict) are captured in ``sink``.
+    """
+    loop = st.session_state._bg_loop
+    while True:
+        try:
+            item = asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result(timeout=REQUEST_TIMEOUT)
+        except StopAsyncIteration:
+            return
         
-        if plan.get("steps"):
-            st.markdown("**Agent Coordination Steps:**")
-            for i, step in enumerate(plan["steps"], 1):
-                agent = step.get("agent", "unknown")
-                status = step.get("status", "pending")
-                task = step.get("task", "Processing...")
-                
-                badge_html = get_agent_badge_html(agent, status)
-                st.markdown(f"""
-                <div class="execution-step">
-                    <strong>Step {i}:</strong> {badge_html}<br>
-                    <em>{task}</em>
-                </div>
-                """, unsafe_allow_html=True)
-
-async def process_message(user_message: str) -> Dict[str, Any]:
-    """Process user message through the orchestrator."""
-    
-    # Clear previous agent activity
+        if isinstance(item, dict):
+            sink.update(item)
+        else:
+            yield item
+
+def merge_memory_delta(context: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    """Merge a memory delta into the displayed context, keeping the last 3 items per category."""
+    for key in MEMORY_CATEGORIES:
+        context.setdefault(key, deque(maxlen=3)).extend(delta.get(key, ()))
+    context["conversation_length"] = delta.get("conversation_length", 0)
+
+def sync_memory_context() -> None:
+    """Bring st.session_state.memory_context up to date using memory's version counter."""
+    memory = get_memory()
+    session_id = st.session_state.session_id
+    seen = st.session_state.get("_mem_v", 0)
+    current = memory.version(session_id)
+    if current == seen:
+        return
+    
+    if current < seen:
+        # Session was reset or expired; rebuild from scratch
+        st.session_state.memory_context = {}
+        seen = 0
+    
+    merge_memory_delta(st.session_state.memory_context, memory.diff_since(session_id, seen))
+    st.session_state._mem_v = current
+
+def process_message(user_message: str, placeholder) -> Dict[str, Any]:
+    """Process user message through the orchestrator, streaming the reply into placeholder."""
+    
+    # Clear previous agent activity; the new turn invalidates cached panel HTML
     st.session_state.agent_activity = []
+    st.session_state._turn += 1
     
     # Add activity tracking
     st.session_state.agent_activity.append({
@@ -231,27 +306,103 @@ async def process_message(user_message: str) -> Dict[str, Any]:
         "action": "Analyzing request and creating plan..."
     })
     
-    # Process the message
-    result = await orchestrator.process_request(user_message, st.session_state.session_id)
+    # Stream the reply; only the orchestrator generator runs on the loop thread
+    placeholder.caption("🤖 Agents are working on your request...")
+    result = {}
+    placeholder.write_stream(_sync_iter(
+        _coalesce(get_orchestrator().stream_request(
+            user_message, st.session_state.session_id, prompt_cache_key=st.session_state.prompt_cache_key
+        )), result
+    ))
     
-    # Update memory context
-    context = memory.get_context_for_agents(st.session_state.session_id)
-    st.session_state.memory_context = context
+    # Merge only what changed in memory since the last turn
+    sync_memory_context()
     
     # Update execution plan
     if result.get("plan_executed"):
         st.session_state.execution_plan = result["plan_executed"]
         
-        # Add agent activities from plan
-        for step in result["plan_executed"].get("steps", []):
-            st.session_state.agent_activity.append({
+        # Add agent activities from plan in one batch once all steps have resolved
+        st.session_state.agent_activity.extend(
+            {
                 "agent": step.get("agent", "unknown"),
                 "status": step.get("status", "completed"),
                 "action": step.get("task", "Completed task")
-            })
+            }
+            for step in result["plan_executed"].get("steps", [])
+        )
     
     return result
 
+def render_message_html(message: Dict[str, Any]) -> str:
+    """Render a message's chat body HTML (done once, when it is added)."""
+    if message["role"] == "user" or not message.get("agents_used"):
+        return message["content"]
+    
+    # Assistant message with agent info
+    agent_badges = " ".join(get_agent_badge_html(agent) for agent in message["agents_used"])
+    return f'{message["content"]}<br><small>Agents used: {agent_badges}</small>'
+
+@lru_cache(maxsize=256)
+def _render_plan_steps(steps: Tuple[Tuple[str, str, str], ...]) -> str:
+    """Render a completed plan's (agent, status, task) steps as one markdown block."""
+    lines = ["**Execution Steps:**"]
+    for agent, status, task in steps:
+        status_emoji = "✅" if status == "completed" else "⏳"
+        lines.append(f"{status_emoji} **{agent}**: {task}")
+    return "\n\n".join(lines)
+
+def prerender_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach the message body HTML and, for plans with steps, the steps markdown."""
+    message["_html"] = render_message_html(message)
+    
+    steps = (message.get("plan_executed") or {}).get("steps")
+    if steps:
+        message["_plan_md"] = _render_plan_steps(tuple(
+            (step.get("agent", "Unknown"), step.get("status", ""), step.get("task", "Task"))
+            for step in steps
+        ))
+    return message
+
+def add_chat_message(**message):
+    """Append a message to the conversation with its markup pre-rendered."""
+    st.session_state.messages.append(prerender_message(message))
+
+def stored_message_count() -> int:
+    """Count the shown messages that are in the memory store (failed turns are shown but never stored)."""
+    return sum(1 for message in st.session_state.messages if message.get("_stored"))
+
+def mark_stored_turn(stored_before: int) -> None:
+    """Flag the last user/assistant pair with whichever of them the turn added to the store."""
+    stored = get_memory().version(st.session_state.session_id) - stored_before
+    messages = st.session_state.messages
+    if stored > 0:
+        messages[-2]["_stored"] = True
+    if stored > 1:
+        messages[-1]["_stored"] = True
+
+def load_earlier_messages() -> None:
+    """Prepend the previous page of stored messages, growing the buffer so they are not evicted."""
+    messages = st.session_state.messages
+    earlier = get_memory().load_earlier(st.session_state.session_id, stored_message_count(), EARLIER_PAGE_SIZE)
+    if not earlier:
+        return
+    
+    history = deque(maxlen=messages.maxlen + len(earlier))
+    for stored in earlier:
+        plan = stored.get("plan_executed") or {}
+        message = {
+            "role": stored["role"],
+            "content": stored["content"],
+            "_stored": True
+        }
+        if stored["role"] == "assistant" and plan:
+            message.update(agents_used=plan.get("agents_involved", []), plan_executed=plan)
+        history.append(prerender_message(message))
+    
+    history.extend(messages)
+    st.session_state.messages = history
+
 def display_chat_interface():
     """Display the main chat interface."""
     
@@ -259,32 +410,18 @@ def display_chat_interface():
     chat_container = st.container()
     
     with chat_container:
-        # Display conversation history
+        # Older messages stay in the memory store until asked for
+        if get_memory().version(st.session_state.session_id) > stored_message_count():
+            if st.button(f"⬆️ Load {EARLIER_PAGE_SIZE} earlier messages", key="load_earlier"):
+                load_earlier_messages()
+        
+        # Display conversation history from the HTML rendered when each message was added
         for message in st.session_state.messages:
-            if message["role"] == "user":
-                st.markdown(f"""
-                <div class="chat-message user-message">
-                    <strong>You:</strong> {message["content"]}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                # Assistant message with agent info
-                agent_info = ""
-                if message.get("agents_used"):
-                    agent_badges = " ".join([
-                        get_agent_badge_html(agent) 
-                        for agent in message["agents_used"]
-                    ])
-                    agent_info = f"<br><small>Agents used: {agent_badges}</small>"
-                
-                st.markdown(f"""
-                <div class="chat-message assistant-message">
-                    <strong>Assistant:</strong> {message["content"]}{agent_info}
-                </div>
-                """, unsafe_allow_html=True)
+            with st.chat_message(message["role"]):
+                st.markdown(message["_html"], unsafe_allow_html=True)
                 
                 # Show execution details in expander
-                if message.get("plan_executed"):
+                if message["role"] == "assistant" and message.get("plan_executed"):
                     with st.expander("🔍 View Agent Coordination Details"):
                         plan = message["plan_executed"]
                         
@@ -296,62 +433,105 @@ def display_chat_interface():
                         with col3:
                             st.metric("Execution Time", f"{message.get('execution_time', 0):.1f}s")
                         
-                        if plan.get("steps"):
-                            st.markdown("**Execution Steps:**")
-                            for step in plan["steps"]:
-                                status_emoji = "✅" if step.get("status") == "completed" else "⏳"
-                                st.write(f"{status_emoji} **{step.get('agent', 'Unknown')}**: {step.get('task', 'Task')}")
+                        if message.get("_plan_md"):
+                            st.markdown(message["_plan_md"])
 
+# Static demo questions shown under the chat, built once at import time
+EXAMPLES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("🛒 Order Support", (
+        "My laptop order #12345 won't turn on, I need help!",
+        "I want to track my order #12346",
+        "How do I return order #12345?",
+        "Is my order #12345 still under warranty?",
+    )),
+    ("💻 Product Questions", (
+        "Compare TechBook Pro 15 vs TechBook Air 13",
+        "What laptops do you have under $1000?",
+        "I need a laptop for gaming, what do you recommend?",
+        "What are the specs of the TechBook Gaming 17?",
+    )),
+    ("🔧 Technical Support", (
+        "My laptop is overheating, what should I do?",
+        "The WiFi on my laptop isn't working",
+        "My laptop is running very slowly",
+        "The screen on my laptop is flickering",
+    )),
+    ("🔄 Follow-up Questions", (
+        "What other options do I have?",
+        "Can you explain that in more detail?",
+        "What would you recommend instead?",
+        "How long will this take?",
+    )),
+)
+
+@st.fragment
 def display_example_questions():
     """Display example questions for easy testing."""
     st.markdown("### 💡 Try These Demo Questions")
     
-    examples = [
-        {
-            "category": "🛒 Order Support",
-            "questions": [
-                "My laptop order #12345 won't turn on, I need help!",
-                "I want to track my order #12346",
-                "How do I return order #12345?",
-                "Is my order #12345 still under warranty?"
-            ]
-        },
-        {
-            "category": "💻 Product Questions", 
-            "questions": [
-                "Compare TechBook Pro 15 vs TechBook Air 13",
-                "What laptops do you have under $1000?",
-                "I need a laptop for gaming, what do you recommend?",
-                "What are the specs of the TechBook Gaming 17?"
-            ]
-        },
-        {
-            "category": "🔧 Technical Support",
-            "questions": [
-                "My laptop is overheating, what should I do?",
-                "The WiFi on my laptop isn't working",
-                "My laptop is running very slowly",
-                "The screen on my laptop is flickering"
-            ]
-        },
-        {
-            "category": "🔄 Follow-up Questions",
-            "questions": [
-                "What other options do I have?",
-                "Can you explain that in more detail?",
-                "What would you recommend instead?",
-                "How long will this take?"
-            ]
-        }
-    ]
-    
-    for category in examples:
-        with st.expander(category["category"]):
-            for question in category["questions"]:
-                if st.button(question, key=f"btn_{hash(question)}"):
+    for cat_idx, (category, questions) in enumerate(EXAMPLES):
+        with st.expander(category):
+            for q_idx, question in enumerate(questions):
+                if st.button(question, key=f"btn_{cat_idx}_{q_idx}"):
                     st.session_state.selected_question = question
                     st.rerun()
 
+@st.fragment
+def chat_panel():
+    """Chat history and input; submitting a message reruns only this fragment until the reply is in."""
+    st.markdown("### 💬 Chat with Multi-Agent System")
+    
+    # Display chat interface
+    display_chat_interface()
+    
+    # Handle selected question from examples
+    if hasattr(st.session_state, 'selected_question'):
+        user_message = st.session_state.selected_question
+        delattr(st.session_state, 'selected_question')
+    else:
+        # Chat input
+        user_message = st.chat_input("Ask me anything about orders, products, or technical support...")
+    
+    if user_message:
+        # Only turns the orchestrator recorded advance the store; see which ones did to page it correctly later
+        stored_before = get_memory().version(st.session_state.session_id)
+        
+        # Add user message
+        add_chat_message(
+            role="user",
+            content=user_message,
+            ts=time.time_ns()
+        )
+        
+        # Show the new turn right away and stream the reply into one assistant placeholder
+        st.chat_message("user").markdown(user_message)
+        placeholder = st.chat_message("assistant").empty()
+        try:
+            result = process_message(user_message, placeholder)
+            
+            # Add assistant response
+            add_chat_message(
+                role="assistant",
+                content=result.get("response", "I apologize, but I encountered an issue processing your request."),
+                agents_used=result.get("plan_executed", {}).get("agents_involved", []),
+                plan_executed=result.get("plan_executed", {}),
+                execution_time=result.get("execution_time", 0),
+                ts=time.time_ns()
+            )
+            mark_stored_turn(stored_before)
+            
+        except Exception as e:
+            st.error(f"Error processing request: {str(e)}")
+            add_chat_message(
+                role="assistant",
+                content="I apologize, but I encountered a technical issue. Please try again.",
+                ts=time.time_ns()
+            )
+            mark_stored_turn(stored_before)
+        
+        # Full rerun so the sidebar, examples and plan reflect the new turn
+        st.rerun(scope="app")
+
 def main():
     """Main Streamlit application."""
     
@@ -365,53 +545,7 @@ def main():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        st.markdown("### 💬 Chat with Multi-Agent System")
-        
-        # Display chat interface
-        display_chat_interface()
-        
-        # Handle selected question from examples
-        if hasattr(st.session_state, 'selected_question'):
-            user_message = st.session_state.selected_question
-            delattr(st.session_state, 'selected_question')
-        else:
-            # Chat input
-            user_message = st.chat_input("Ask me anything about orders, products, or technical support...")
-        
-        if user_message:
-            # Add user message
-            st.session_state.messages.append({
-                "role": "user", 
-                "content": user_message,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            # Show processing indicator
-            with st.spinner("🤖 Agents are working on your request..."):
-                # Process message
-                try:
-                    result = asyncio.run(process_message(user_message))
-                    
-                    # Add assistant response
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": result.get("response", "I apologize, but I encountered an issue processing your request."),
-                        "agents_used": result.get("plan_executed", {}).get("agents_involved", []),
-                        "plan_executed": result.get("plan_executed", {}),
-                        "execution_time": result.get("execution_time", 0),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    
-                except Exception as e:
-                    st.error(f"Error processing request: {str(e)}")
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": "I apologize, but I encountered a technical issue. Please try again.",
-                        "timestamp": datetime.now().isoformat()
-                    })
-            
-            # Rerun to update the display
-            st.rerun()
+        chat_panel()
     
     with col2:
         # Right sidebar content
@@ -420,19 +554,19 @@ def main():
         # Session info
         st.info(f"**Session:** `{st.session_state.session_id}`")
         
-        # Display agent activity
-        display_agent_activity()
-        
-        # Display memory context  
-        display_memory_context()
+        # Display agent activity and memory context
+        with st.sidebar:
+            render_sidebar()
         
         # Reset conversation button
         if st.button("🔄 Reset Conversation", type="secondary"):
-            st.session_state.messages = []
+            st.session_state.messages = deque(maxlen=MAX_VISIBLE_MESSAGES)
             st.session_state.agent_activity = []
             st.session_state.memory_context = {}
+            st.session_state._mem_v = 0
+            st.session_state._panel_html = {}
             st.session_state.execution_plan = None
-            memory.clear_session(st.session_state.session_id)
+            get_memory().clear_session(st.session_state.session_id)
             st.success("Conversation reset!")
             st.rerun()
     
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Unit tests for the logging formatters and handlers."""
+
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.logging_config import CounterRotatingFileHandler, FastFormatter
+
+def make_record(msg="hello %s", args=("world",), name="agents.order_agent", level=logging.INFO):
+    """Build a log record the way a logger would."""
+    return logging.LogRecord(name, level, __file__, 42, msg, args, None, func="handler")
+
+class FastFormatterTest(unittest.TestCase):
+    """FastFormatter must render exactly what logging.Formatter renders."""
+    
+    FORMATS = {
+        "%": [
+            "%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s",
+            "%(levelname)8s:%(lineno)s %(funcName)s {braces} %(message)s",
+            "%(name)-20s \"x\" 'y' | %(levelname)-8s | %(message)s",
+            "%(name)-20s \\ %(module)s | %(message)s",
+        ],
+        "{": [
+            "{asctime} | {name:<20} | {levelname:<8} | {message}",
+            "{levelname} %(name)s {message}",
+        ],
+        "$": [
+            "$asctime | $name | $levelname | $message",
+            "${levelname} %(name)-20s $message",
+        ],
+    }
+    
+    def assert_same_output(self, fmt, style, datefmt=None):
+        expected = logging.Formatter(fmt=fmt, datefmt=datefmt, style=style)
+        actual = FastFormatter(fmt=fmt, datefmt=datefmt, style=style)
+        for record in (make_record(), make_record("plain", (), name="root", level=logging.WARNING)):
+            self.assertEqual(actual.format(record), expected.format(record))
+    
+    def test_matches_stdlib_for_all_styles(self):
+        for style, formats in self.FORMATS.items():
+            for fmt in formats:
+                for datefmt in (None, "%H:%M:%S"):
+                    with self.subTest(style=style, fmt=fmt, datefmt=datefmt):
+                        self.assert_same_output(fmt, style, datefmt)
+    
+    def test_quoted_literals_still_compile(self):
+        self.assertIsNotNone(FastFormatter(fmt='%(name)-20s "x" \'y\' | %(message)s')._render)
+    
+    def test_only_percent_style_is_compiled(self):
+        self.assertIsNotNone(FastFormatter(fmt="%(name)s %(message)s")._render)
+        self.assertIsNone(FastFormatter(fmt="{name} {message}", style="{")._render)
+        self.assertIsNone(FastFormatter(fmt="$name $message", style="$")._render)
+    
+    def test_exception_records_use_generic_path(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("tools", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+        fmt = "%(name)-20s | %(message)s"
+        self.assertEqual(FastFormatter(fmt=fmt).format(record), logging.Formatter(fmt=fmt).format(record))
+
+class CountingFormatter(logging.Formatter):
+    """Formatter that counts how often it is asked to format."""
+    
+    calls = 0
+    
+    def format(self, record):
+        self.calls += 1
+        return super().format(record)
+
+class CounterRotatingFileHandlerTest(unittest.TestCase):
+    """Rotation must follow the encoded size on disk and format each record once."""
+    
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmpdir.name, "app.log")
+    
+    def tearDown(self):
+        self._tmpdir.cleanup()
+    
+    def test_rotates_on_encoded_bytes(self):
+        handler = CounterRotatingFileHandler(self.path, maxBytes=100, backupCount=20, encoding="utf-8")
+        formatter = CountingFormatter("%(message)s")
+        handler.setFormatter(formatter)
+        # 30 characters but 59 bytes in UTF-8: counting characters would put three per file and overflow it
+        messages = [f"{i:02d}" + "é" * 28 for i in range(12)]
+        try:
+            for message in messages:
+                handler.handle(make_record(message, ()))
+        finally:
+            handler.close()
+        
+        self.assertEqual(formatter.calls, len(messages))
+        files = [self.path] + [f"{self.path}.{n}" for n in range(1, 21) if os.path.exists(f"{self.path}.{n}")]
+        for path in files:
+            self.assertLessEqual(os.path.getsize(path), 100)
+        
+        # Every record lands exactly once across the rotated files, oldest backup first
+        written = []
+        for path in reversed(files):
+            with open(path, encoding="utf-8") as log_file:
+                written.extend(log_file.read().splitlines())
+        self.assertEqual(written, messages)
+    
+    def test_default_encoding_writes_and_rotates(self):
+        # No encoding argument: FileHandler stores "locale" (3.10+), which is not a codec name
+        handler = CounterRotatingFileHandler(self.path, maxBytes=100, backupCount=5, delay=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        messages = [f"record {i:02d} " + "x" * 30 for i in range(6)]
+        try:
+            for message in messages:
+                handler.handle(make_record(message, ()))
+        finally:
+            handler.close()
+        
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        written = []
+        for path in (f"{self.path}.2", f"{self.path}.1", self.path):
+            self.assertLessEqual(os.path.getsize(path), 100)
+            with open(path) as log_file:
+                written.extend(log_file.read().splitlines())
+        self.assertEqual(written, messages)
+    
+    def test_counts_existing_file(self):
+        with open(self.path, "w", encoding="utf-8") as log_file:
+            log_file.write("x" * 90 + "\n")
+        handler = CounterRotatingFileHandler(self.path, maxBytes=100, backupCount=1, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            handler.handle(make_record("0123456789", ()))
+        finally:
+            handler.close()
+        
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertEqual(os.path.getsize(self.path), 11)
+
+if __name__ == "__main__":
+    unittest.main()
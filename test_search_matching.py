@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Unit tests keeping the Aho-Corasick matchers in step with their regex fallbacks."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import data.mock_data as mock_data
+import tools.knowledge_tools as knowledge_tools
+
+QUERIES = [
+    "My laptop won't turn on",
+    "laptop éslow",
+    "screenñ flickering",
+    "über-laptop is slow",
+    "wifi2 keeps dropping wifi",
+    "ſhipping for my order",
+    "SHIPPING and Warranty",
+    "",
+]
+
+class QueryTokensTest(unittest.TestCase):
+    """Whole-word knowledge base tokens, with the ASCII [a-z0-9] boundaries of the tokenizer."""
+    
+    def test_automaton_matches_tokenizer(self):
+        for query in QUERIES:
+            with self.subTest(query=query):
+                expected = set(mock_data._tokenize(query)) & mock_data._KB_INDEX.keys()
+                self.assertEqual(mock_data._query_tokens(query) & mock_data._KB_INDEX.keys(), expected)
+                with mock.patch.object(mock_data, "_KB_AUTOMATON", None):
+                    self.assertEqual(mock_data._query_tokens(query) & mock_data._KB_INDEX.keys(), expected)
+
+class FaqKeyTest(unittest.TestCase):
+    """First FAQ key, in FAQ order, found anywhere in the lowercased question."""
+    
+    def test_automaton_matches_fallback(self):
+        for query in QUERIES:
+            with self.subTest(query=query):
+                lowered = query.lower()
+                expected = next((key for key in knowledge_tools._FAQ_RESPONSES if key in lowered), None)
+                self.assertEqual(knowledge_tools._match_faq_key(query), expected)
+                with mock.patch.object(knowledge_tools, "_FAQ_AUTOMATON", None):
+                    self.assertEqual(knowledge_tools._match_faq_key(query), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Unit tests for SQLite-backed session persistence."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep the module-level memory instance off the app's memory.db
+os.environ["MEMORY_DB_PATH"] = ":memory:"
+
+from memory.session_memory import SessionMemory
+
+class SessionPersistenceTest(unittest.TestCase):
+    """Sessions written by one SessionMemory must read back the same from a fresh one."""
+    
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self._tmpdir.name, "memory.db")
+        self.memory = SessionMemory(db_path=self.db_path)
+    
+    def tearDown(self):
+        self.memory.close()
+        self._tmpdir.cleanup()
+    
+    def reopen(self):
+        """Close the current store and open a new one on the same file, with an empty in-RAM cache."""
+        self.memory.close()
+        self.memory = SessionMemory(db_path=self.db_path)
+        return self.memory
+    
+    def test_round_trip_after_reopen(self):
+        session_id = self.memory.create_session("round-trip")
+        self.memory.add_message(session_id, "user", "My laptop order #12345 is overheating")
+        self.memory.add_message(session_id, "assistant", "Let me check that order",
+                                agent_used="order_agent", tools_used=["get_order_info"],
+                                plan_executed={"plan_id": "p1", "steps": 2})
+        self.memory.update_customer_context(session_id, {"tier": "gold"})
+        before = self.memory.get_conversation_history(session_id)
+        context_before = self.memory.get_context_for_agents(session_id)
+        
+        memory = self.reopen()
+        self.assertEqual(memory.get_conversation_history(session_id), before)
+        context_after = memory.get_context_for_agents(session_id)
+        self.assertEqual(context_after, context_before)
+        self.assertEqual(context_after["orders_discussed"], ["12345"])
+        self.assertEqual(context_after["customer_context"], {"tier": "gold"})
+        self.assertEqual(memory.version(session_id), 2)
+        self.assertEqual(memory.get_all_session_ids(), [session_id])
+    
+    def test_recreated_session_starts_empty(self):
+        session_id = self.memory.create_session("reset-me")
+        self.memory.add_message(session_id, "user", "My laptop screen flickers on order #555")
+        self.memory.create_session(session_id)
+        self.assertEqual(self.memory.get_conversation_history(session_id), [])
+        
+        memory = self.reopen()
+        self.assertEqual(memory.get_conversation_history(session_id), [])
+        context = memory.get_context_for_agents(session_id)
+        self.assertEqual(context["orders_discussed"], [])
+        self.assertEqual(context["issues_mentioned"], [])
+        self.assertEqual(context["products_discussed"], [])
+    
+    def test_cleared_session_is_gone_after_reopen(self):
+        session_id = self.memory.create_session("clear-me")
+        self.memory.add_message(session_id, "user", "hello")
+        self.assertTrue(self.memory.clear_session(session_id))
+        
+        memory = self.reopen()
+        self.assertIsNone(memory.get_session(session_id))
+        self.assertEqual(memory.get_all_session_ids(), [])
+    
+    def stored_rows(self, session_id):
+        """Row counts per table for one session ID, straight from the database."""
+        return {
+            table: self.memory._conn.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            for table in ("sessions", "messages", "context_items")
+        }
+    
+    def test_clear_session_empties_every_table(self):
+        kept = self.memory.create_session("keep-me")
+        self.memory.add_message(kept, "user", "My laptop order #777 is slow")
+        session_id = self.memory.create_session("clear-rows")
+        self.memory.add_message(session_id, "user", "My laptop order #12345 won't turn on")
+        self.assertEqual(self.stored_rows(session_id), {"sessions": 1, "messages": 1, "context_items": 3})
+        
+        self.memory.clear_session(session_id)
+        self.assertEqual(self.stored_rows(session_id), {"sessions": 0, "messages": 0, "context_items": 0})
+        self.assertEqual(self.stored_rows(kept)["messages"], 1)
+        
+        self.memory.clear_all_sessions()
+        self.assertEqual(self.stored_rows(kept), {"sessions": 0, "messages": 0, "context_items": 0})
+
+if __name__ == "__main__":
+    unittest.main()
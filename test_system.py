@@ -3,10 +3,27 @@
 
 import sys
 import os
+import asyncio
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Keep test sessions out of the app's memory.db
+os.environ["MEMORY_DB_PATH"] = ":memory:"
+
+_loop = None
+
+def run_async(coro):
+    """Run a coroutine on one event loop shared by all tests (uvloop when available)."""
+    global _loop
+    if _loop is None:
+        try:
+            import uvloop
+            _loop = uvloop.new_event_loop()
+        except ImportError:
+            _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
 def test_basic_imports():
     """Test basic module imports without API dependencies."""
     print("🧪 Testing basic module imports...")
@@ -61,7 +78,6 @@ def test_planning_system():
     
     try:
         from planning.planner import planner
-        import asyncio
         
         async def test_plan():
             # Test plan creation
@@ -80,7 +96,7 @@ def test_planning_system():
             return True
         
         # Run async test
-        result = asyncio.run(test_plan())
+        result = run_async(test_plan())
         return result
         
     except Exception as e:
@@ -138,7 +154,6 @@ def test_tools_without_api():
     try:
         # Test order tools
         from tools.order_tools import order_tools
-        import asyncio
         
         async def test_order_tools():
             order_info = await order_tools.get_order_info("12345")
@@ -150,7 +165,7 @@ def test_tools_without_api():
             
             return True
         
-        result = asyncio.run(test_order_tools())
+        result = run_async(test_order_tools())
         return result
         
     except Exception as e:
@@ -183,6 +198,9 @@ def main():
         except Exception as e:
             print(f"❌ FAILED with exception: {e}\n")
     
+    if _loop is not None:
+        _loop.close()
+    
     print("=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
     
@@ -1,51 +1,159 @@
 """Knowledge base and policy tools for customer support."""
 
 import logging
-from typing import List, Dict, Any, Optional
-from data.mock_data import search_knowledge_base, get_policy
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, Mapping, Optional, Tuple
+from tools.lookup_cache import cached_search_knowledge_base, cached_get_policy
 
 logger = logging.getLogger(__name__)
 
+# Static payloads shared by every call; frozen so no caller can alter them for the next one
+_GENERAL_STEPS = (
+    "Restart the device and try again",
+    "Check all cable connections",
+    "Update device drivers and software",
+    "Contact technical support if issue persists"
+)
+
+_WHEN_TO_ESCALATE = (
+    "Issue persists after following all troubleshooting steps",
+    "Device shows signs of physical damage",
+    "Multiple attempts at basic fixes have failed",
+    "Customer reports unusual sounds, smells, or excessive heat"
+)
+
+_ESCALATION_PROCESS = (
+    "Document all troubleshooting steps attempted",
+    "Gather device information (model, warranty status)",
+    "Create technical support ticket",
+    "Schedule callback or in-person service if needed"
+)
+
+_WARRANTY_TIPS = (
+    "Keep original receipt and warranty documentation",
+    "Register product within 30 days of purchase",
+    "Perform regular maintenance as recommended",
+    "Report issues as soon as they occur"
+)
+
+_RETURN_PREP_TIPS = (
+    "Ensure item is in original condition",
+    "Include all original accessories and packaging",
+    "Clean the item before returning",
+    "Remove all personal data from electronic devices"
+)
+
+_FAQ_RESPONSES = MappingProxyType({
+    "shipping": MappingProxyType({
+        "question": "How long does shipping take?",
+        "answer": "Standard shipping takes 3-5 business days. Express shipping takes 1-2 business days. Free shipping is available on orders over $500."
+    }),
+    "payment": MappingProxyType({
+        "question": "What payment methods do you accept?",
+        "answer": "We accept all major credit cards, PayPal, Apple Pay, and bank transfers. Payment plans are available for purchases over $1000."
+    }),
+    "warranty": MappingProxyType({
+        "question": "How does the warranty work?",
+        "answer": "Warranty period varies by product (1-3 years). Covers manufacturing defects and hardware failures. Registration required within 30 days."
+    }),
+    "support": MappingProxyType({
+        "question": "How can I contact support?",
+        "answer": "Support is available 24/7 via chat, email, or phone. For technical issues, our specialist team is available Mon-Fri 8AM-8PM."
+    })
+})
+
+# Optional Aho-Corasick automaton over the FAQ keys (pip install pyahocorasick)
+try:
+    import ahocorasick
+    _FAQ_AUTOMATON = ahocorasick.Automaton()
+    for _rank, _key in enumerate(_FAQ_RESPONSES):
+        _FAQ_AUTOMATON.add_word(_key, (_rank, _key))
+    _FAQ_AUTOMATON.make_automaton()
+except ImportError:
+    _FAQ_AUTOMATON = None
+
+# Fallback matcher: one alternation over the keys, with their FAQ order. It runs on the lowercased question
+# like the automaton, since IGNORECASE folds more (e.g. the long s 'ſ' matches 's') than str.lower() does
+_FAQ_RE = re.compile("|".join(map(re.escape, _FAQ_RESPONSES)))
+_FAQ_RANK = {key: rank for rank, key in enumerate(_FAQ_RESPONSES)}
+
+def _match_faq_key(question: str) -> Optional[str]:
+    """Return the first FAQ key (in FAQ order) that occurs in the question, if any."""
+    if _FAQ_AUTOMATON is None:
+        hits = {m.group() for m in _FAQ_RE.finditer(question.lower())}
+        return min(hits, key=_FAQ_RANK.__getitem__, default=None)
+    
+    # One pass over the question; keep FAQ order as the tie-break between several hits
+    best = min((match for _, match in _FAQ_AUTOMATON.iter(question.lower())), default=None)
+    return best[1] if best else None
+
+_DEVICE_GUIDES = MappingProxyType({
+    "laptop": MappingProxyType({
+        "tips": (
+            "Check power adapter LED indicator",
+            "Try removing battery for 30 seconds",
+            "Ensure proper ventilation around device",
+            "Check for Windows updates and driver updates"
+        ),
+        "common_causes": (
+            "Power adapter failure",
+            "Battery degradation",
+            "Overheating due to dust buildup",
+            "Software conflicts or outdated drivers"
+        )
+    }),
+    "techbook": MappingProxyType({
+        "tips": (
+            "Use TechBook diagnostic tool in BIOS",
+            "Check TechBook support portal for device-specific guides",
+            "Ensure latest TechBook software is installed",
+            "Review TechBook maintenance schedule"
+        ),
+        "common_causes": (
+            "Firmware outdated",
+            "TechBook-specific driver issues",
+            "Hardware compatibility problems",
+            "Thermal management issues"
+        )
+    })
+})
+
 class KnowledgeTools:
     """Tools for accessing knowledge base and company policies."""
     
     async def search_knowledge(self, issue: str) -> List[str]:
         """Search knowledge base for troubleshooting steps."""
         try:
-            steps = search_knowledge_base(issue)
+            steps = cached_search_knowledge_base(issue)
             
             if steps:
-                logger.info(f"Found {len(steps)} troubleshooting steps for: {issue}")
-                return steps
+                logger.info("Found %d troubleshooting steps for: %s", len(steps), issue)
+                return list(steps)
             else:
                 # Fallback to general advice
-                general_steps = [
-                    "Restart the device and try again",
-                    "Check all cable connections",
-                    "Update device drivers and software",
-                    "Contact technical support if issue persists"
-                ]
-                logger.info(f"No specific steps found for '{issue}', returning general advice")
-                return general_steps
+                logger.info("No specific steps found for '%s', returning general advice", issue)
+                return list(_GENERAL_STEPS)
                 
         except Exception as e:
-            logger.error(f"Error searching knowledge base: {e}")
+            logger.error("Error searching knowledge base: %s", e)
             return ["Please contact technical support for assistance"]
     
-    async def get_policies(self, policy_type: str) -> Dict[str, Any]:
-        """Retrieve company policy information."""
+    async def get_policies(self, policy_type: str) -> Mapping[str, Any]:
+        """Retrieve company policy information as a read-only mapping."""
         try:
-            policy = get_policy(policy_type)
+            policy = cached_get_policy(policy_type)
             
             if policy:
-                logger.info(f"Retrieved {policy_type} policy")
+                logger.info("Retrieved %s policy", policy_type)
                 return policy
             else:
-                logger.warning(f"Policy type '{policy_type}' not found")
+                logger.warning("Policy type '%s' not found", policy_type)
                 return {"error": f"Policy type '{policy_type}' not found"}
                 
         except Exception as e:
-            logger.error(f"Error retrieving policy {policy_type}: {e}")
+            logger.error("Error retrieving policy %s: %s", policy_type, e)
             return {"error": str(e)}
     
     async def get_troubleshooting_guide(self, device_type: str, issue: str) -> Dict[str, Any]:
@@ -62,166 +170,103 @@ class KnowledgeTools:
                 "device_type": device_type,
                 "issue": issue,
                 "basic_troubleshooting": basic_steps,
-                "device_specific_tips": device_info.get("tips", []),
-                "common_causes": device_info.get("common_causes", []),
-                "when_to_escalate": [
-                    "Issue persists after following all troubleshooting steps",
-                    "Device shows signs of physical damage",
-                    "Multiple attempts at basic fixes have failed",
-                    "Customer reports unusual sounds, smells, or excessive heat"
-                ],
-                "escalation_process": [
-                    "Document all troubleshooting steps attempted",
-                    "Gather device information (model, warranty status)",
-                    "Create technical support ticket",
-                    "Schedule callback or in-person service if needed"
-                ]
+                "device_specific_tips": device_info["tips"],
+                "common_causes": device_info["common_causes"],
+                "when_to_escalate": _WHEN_TO_ESCALATE,
+                "escalation_process": _ESCALATION_PROCESS
             }
             
-            logger.info(f"Generated troubleshooting guide for {device_type} - {issue}")
+            logger.info("Generated troubleshooting guide for %s - %s", device_type, issue)
             return guide
             
         except Exception as e:
-            logger.error(f"Error creating troubleshooting guide: {e}")
+            logger.error("Error creating troubleshooting guide: %s", e)
             return {"error": str(e)}
     
     async def get_warranty_coverage(self, warranty_type: str) -> Dict[str, Any]:
         """Get detailed warranty coverage information."""
-        try:
-            warranty_policy = await self.get_policies("warranty")
-            
-            if "error" in warranty_policy:
-                return warranty_policy
-            
-            coverage_info = {
-                "warranty_type": warranty_type,
-                "coverage_details": warranty_policy["coverage"],
-                "exclusions": warranty_policy["exclusions"],
-                "claim_process": warranty_policy["process"],
-                "tips": [
-                    "Keep original receipt and warranty documentation",
-                    "Register product within 30 days of purchase",
-                    "Perform regular maintenance as recommended",
-                    "Report issues as soon as they occur"
-                ]
-            }
-            
-            logger.info(f"Retrieved warranty coverage for {warranty_type}")
-            return coverage_info
-            
-        except Exception as e:
-            logger.error(f"Error getting warranty coverage: {e}")
-            return {"error": str(e)}
+        warranty_policy = await self.get_policies("warranty")
+        
+        if "error" in warranty_policy:
+            return warranty_policy
+        
+        coverage_info = {
+            "warranty_type": warranty_type,
+            **_response_template("warranty", warranty_policy, _warranty_coverage_fields)
+        }
+        
+        logger.info("Retrieved warranty coverage for %s", warranty_type)
+        return coverage_info
     
     async def get_return_guidelines(self, reason: str) -> Dict[str, Any]:
         """Get specific return guidelines based on return reason."""
-        try:
-            return_policy = await self.get_policies("return")
-            
-            if "error" in return_policy:
-                return return_policy
-            
-            # Determine if return reason qualifies for free return
-            free_return = reason.lower() in return_policy["free_return_reasons"]
-            
-            guidelines = {
-                "return_reason": reason,
-                "is_free_return": free_return,
-                "return_period": f"{return_policy['period_days']} days",
-                "condition_requirements": return_policy["condition"],
-                "restocking_fee": 0 if free_return else return_policy["restocking_fee"],
-                "process_steps": return_policy["process"],
-                "preparation_tips": [
-                    "Ensure item is in original condition",
-                    "Include all original accessories and packaging",
-                    "Clean the item before returning",
-                    "Remove all personal data from electronic devices"
-                ]
-            }
-            
-            logger.info(f"Generated return guidelines for reason: {reason}")
-            return guidelines
-            
-        except Exception as e:
-            logger.error(f"Error getting return guidelines: {e}")
-            return {"error": str(e)}
+        return_policy = await self.get_policies("return")
+        
+        if "error" in return_policy:
+            return return_policy
+        
+        # Determine if return reason qualifies for free return
+        free_return = reason.lower() in return_policy["free_return_reasons"]
+        
+        guidelines = {
+            "return_reason": reason,
+            "is_free_return": free_return,
+            "restocking_fee": 0 if free_return else return_policy["restocking_fee"],
+            **_response_template("return", return_policy, _return_guideline_fields)
+        }
+        
+        logger.info("Generated return guidelines for reason: %s", reason)
+        return guidelines
     
-    async def search_faq(self, question: str) -> Dict[str, Any]:
+    async def search_faq(self, question: str) -> Mapping[str, Any]:
         """Search frequently asked questions."""
-        try:
-            # Simplified FAQ search - in real implementation, this would use NLP
-            question_lower = question.lower()
-            
-            faq_responses = {
-                "shipping": {
-                    "question": "How long does shipping take?",
-                    "answer": "Standard shipping takes 3-5 business days. Express shipping takes 1-2 business days. Free shipping is available on orders over $500."
-                },
-                "payment": {
-                    "question": "What payment methods do you accept?",
-                    "answer": "We accept all major credit cards, PayPal, Apple Pay, and bank transfers. Payment plans are available for purchases over $1000."
-                },
-                "warranty": {
-                    "question": "How does the warranty work?",
-                    "answer": "Warranty period varies by product (1-3 years). Covers manufacturing defects and hardware failures. Registration required within 30 days."
-                },
-                "support": {
-                    "question": "How can I contact support?",
-                    "answer": "Support is available 24/7 via chat, email, or phone. For technical issues, our specialist team is available Mon-Fri 8AM-8PM."
-                }
-            }
-            
-            # Find matching FAQ
-            for key, faq in faq_responses.items():
-                if key in question_lower:
-                    logger.info(f"Found FAQ match for: {question}")
-                    return faq
-            
-            # No direct match found
-            logger.info(f"No FAQ match found for: {question}")
-            return {
-                "question": question,
-                "answer": "I don't have a specific FAQ for that question, but I can help you find the information you need. Could you provide more details about what you're looking for?"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error searching FAQ: {e}")
-            return {"error": str(e)}
-    
-    def _get_device_specific_info(self, device_type: str) -> Dict[str, Any]:
-        """Get device-specific troubleshooting information."""
-        device_guides = {
-            "laptop": {
-                "tips": [
-                    "Check power adapter LED indicator",
-                    "Try removing battery for 30 seconds",
-                    "Ensure proper ventilation around device",
-                    "Check for Windows updates and driver updates"
-                ],
-                "common_causes": [
-                    "Power adapter failure",
-                    "Battery degradation",
-                    "Overheating due to dust buildup",
-                    "Software conflicts or outdated drivers"
-                ]
-            },
-            "techbook": {
-                "tips": [
-                    "Use TechBook diagnostic tool in BIOS",
-                    "Check TechBook support portal for device-specific guides",
-                    "Ensure latest TechBook software is installed",
-                    "Review TechBook maintenance schedule"
-                ],
-                "common_causes": [
-                    "Firmware outdated",
-                    "TechBook-specific driver issues",
-                    "Hardware compatibility problems",
-                    "Thermal management issues"
-                ]
-            }
-        }
+        # Simplified FAQ search - in real implementation, this would use NLP
+        key = _match_faq_key(question)
+        if key:
+            logger.info("Found FAQ match for: %s", question)
+            return _FAQ_RESPONSES[key]
         
-        return device_guides.get(device_type.lower(), device_guides["laptop"])
+        # No direct match found
+        logger.info("No FAQ match found for: %s", question)
+        return {
+            "question": question,
+            "answer": "I don't have a specific FAQ for that question, but I can help you find the information you need. Could you provide more details about what you're looking for?"
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _get_device_specific_info(device_type: str) -> Mapping[str, Any]:
+        """Get device-specific troubleshooting information, memoized per device type."""
+        return _DEVICE_GUIDES.get(device_type.lower(), _DEVICE_GUIDES["laptop"])
+
+# Per-policy response fields that don't depend on the call, keyed by the policy view they came from
+_TEMPLATES: Dict[str, Tuple[Mapping[str, Any], Dict[str, Any]]] = {}
+
+def _response_template(policy_type: str, policy: Mapping[str, Any],
+                       build: Callable[[Mapping[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the prebuilt static part of a policy response, rebuilding it if the policy was reloaded."""
+    entry = _TEMPLATES.get(policy_type)
+    if entry is None or entry[0] is not policy:
+        entry = _TEMPLATES[policy_type] = (policy, build(policy))
+    return entry[1]
+
+def _warranty_coverage_fields(policy: Mapping[str, Any]) -> Dict[str, Any]:
+    """Static fields of a warranty coverage response."""
+    return {
+        "coverage_details": policy["coverage"],
+        "exclusions": policy["exclusions"],
+        "claim_process": policy["process"],
+        "tips": _WARRANTY_TIPS
+    }
+
+def _return_guideline_fields(policy: Mapping[str, Any]) -> Dict[str, Any]:
+    """Static fields of a return guidelines response."""
+    return {
+        "return_period": f"{policy['period_days']} days",
+        "condition_requirements": policy["condition"],
+        "process_steps": policy["process"],
+        "preparation_tips": _RETURN_PREP_TIPS
+    }
 
 # Global knowledge tools instance
 knowledge_tools = KnowledgeTools()
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""Read-only views over the static policy and knowledge base lookups."""
+
+from functools import lru_cache
+from typing import Any, Mapping, Optional, Tuple
+from data import _snapshot
+from data.mock_data import search_knowledge_base
+
+def cached_get_policy(policy_type: str) -> Optional[Mapping[str, Any]]:
+    """Get a frozen view of a company policy from the import-time snapshot."""
+    return _snapshot.POLICY_SNAPSHOT.get(policy_type)
+
+@lru_cache(maxsize=256)
+def cached_search_knowledge_base(issue: str) -> Tuple[str, ...]:
+    """Get the troubleshooting steps for an issue as a tuple, memoized per query."""
+    return tuple(search_knowledge_base(issue))
+
+def clear_lookup_caches() -> None:
+    """Drop memoized lookups, e.g. after policies or the knowledge base are reloaded."""
+    _snapshot.refresh()
+    cached_search_knowledge_base.cache_clear()
@@ -0,0 +1,94 @@
+"""Two-tier cache for order lookups: an in-process TTL cache backed by optional Redis."""
+
+import asyncio
+import json
+import logging
+import math
+import weakref
+from typing import Any, Dict, Optional
+from data.async_client import data_client
+from utils.ttl_cache import TTLCache
+from config import ORDER_CACHE_TTL, REDIS_URL
+
+# Redis is only needed when several workers should share cached orders (pip install redis)
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+try:
+    import orjson
+    _dumps, _loads = orjson.dumps, orjson.loads
+except ImportError:
+    _dumps, _loads = json.dumps, json.loads
+
+logger = logging.getLogger(__name__)
+
+class OrderCache:
+    """Caches orders in process (L1) and, when REDIS_URL is set, in Redis (L2)."""
+    
+    def __init__(self, redis_url: str = "", ttl: float = 30.0, maxsize: int = 10_000):
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl_seconds = max(1, math.ceil(ttl))
+        
+        if redis_url and aioredis is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using the in-process cache only")
+        self._redis_url = redis_url if aioredis is not None else ""
+        
+        # redis.asyncio connections belong to the loop that opened them, so keep one client per loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+    
+    def _redis(self):
+        """Return this loop's Redis client, or None when L2 is disabled."""
+        if not self._redis_url:
+            return None
+        
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = aioredis.from_url(self._redis_url, socket_connect_timeout=0.5)
+        return client
+    
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve an order via L1, then L2, then the data store."""
+        order = self._local.get(order_id)
+        if order is not None:
+            return order
+        
+        key = f"order:{order_id}"
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = await client.get(key)
+                if raw is not None:
+                    order = _loads(raw)
+                    self._local.set(order_id, order)
+                    return order
+            except Exception as e:
+                logger.warning("Redis lookup for %s failed: %s", key, e)
+        
+        order = await data_client.get_order(order_id)
+        if order is None:
+            return None
+        
+        self._local.set(order_id, order)
+        if client is not None:
+            try:
+                await client.set(key, _dumps(order), ex=self._ttl_seconds)
+            except Exception as e:
+                logger.warning("Redis store for %s failed: %s", key, e)
+        return order
+    
+    async def invalidate(self, order_id: str):
+        """Forget a cached order after it changes."""
+        self._local.pop(order_id)
+        
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.delete(f"order:{order_id}")
+            except Exception as e:
+                logger.warning("Redis invalidation for order %s failed: %s", order_id, e)
+
+# Global order cache instance
+order_cache = OrderCache(REDIS_URL, ORDER_CACHE_TTL)
@@ -1,46 +1,65 @@
 """Order management tools for customer service operations."""
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
-from data.mock_data import get_order, get_policy
+from datetime import date, timedelta
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
+from tools.order_cache import order_cache
+from tools.lookup_cache import cached_get_policy
 
 logger = logging.getLogger(__name__)
 
+# Mock carrier details shared by every tracking response
+_CARRIER = "FastShip Express"
+_SIGNED_BY = "Resident"
+_TRACKING_NUMBER = "TRK{}2024".format
+
+_LOCATIONS = MappingProxyType({
+    "processing": "Fulfillment Center",
+    "shipped": "In Transit - Regional Hub",
+    "delivered": "Delivered to Address"
+})
+
 class OrderTools:
     """Tools for order management and tracking."""
     
     async def get_order_info(self, order_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve comprehensive order information."""
         try:
-            order = get_order(order_id)
+            order = await order_cache.get_order(order_id)
             if not order:
                 return None
             
-            # Add calculated fields
-            order_info = order.copy()
-            order_info["order_age_days"] = self._calculate_order_age(order["order_date"])
-            order_info["warranty_status"] = self._check_warranty_status(order)
-            order_info["return_eligible"] = self._check_return_eligibility(order)
+            # Parse the order's dates and read today's date once for all derived fields
+            today = date.today()
+            order_dt = self._parse_date(order.get("order_date"))
             
-            logger.info(f"Retrieved order info for {order_id}")
+            # Build the response in one pass: the stored order plus calculated fields
+            order_info = {
+                **order,
+                "order_age_days": self._calculate_order_age(order_dt, today),
+                "warranty_status": self._check_warranty_status(self._parse_date(order.get("warranty_expires")), today),
+                "return_eligible": self._check_return_eligibility(order, order_dt, today)
+            }
+            
+            logger.info("Retrieved order info for %s", order_id)
             return order_info
             
         except Exception as e:
-            logger.error(f"Error retrieving order {order_id}: {e}")
+            logger.error("Error retrieving order %s: %s", order_id, e)
             return None
     
     async def check_warranty(self, order_id: str) -> Dict[str, Any]:
         """Check warranty status for an order."""
         try:
-            order = get_order(order_id)
+            order = await order_cache.get_order(order_id)
             if not order:
                 return {"error": "Order not found"}
             
-            warranty_info = self._check_warranty_status(order)
+            warranty_info = self._check_warranty_status(self._parse_date(order.get("warranty_expires")), date.today())
             
             # Get warranty policy details
-            policy = get_policy("warranty")
+            policy = cached_get_policy("warranty")
             warranty_period = order.get("warranty", "1 year")
             
             result = {
@@ -49,41 +68,41 @@ class OrderTools:
                 "warranty_expires": order.get("warranty_expires"),
                 "is_active": warranty_info["is_active"],
                 "days_remaining": warranty_info["days_remaining"],
-                "coverage": policy["coverage"].get(warranty_period.replace(" ", "_"), []),
+                "coverage": policy["coverage_by_period"].get(warranty_period, ()),
                 "exclusions": policy["exclusions"]
             }
             
-            logger.info(f"Checked warranty for order {order_id}: {warranty_info['is_active']}")
+            logger.info("Checked warranty for order %s: %s", order_id, warranty_info["is_active"])
             return result
             
         except Exception as e:
-            logger.error(f"Error checking warranty for {order_id}: {e}")
+            logger.error("Error checking warranty for %s: %s", order_id, e)
             return {"error": str(e)}
     
     async def initiate_return(self, order_id: str, reason: str) -> Dict[str, Any]:
         """Initiate the return process for an order."""
         try:
-            order = get_order(order_id)
+            order = await order_cache.get_order(order_id)
             if not order:
                 return {"error": "Order not found"}
             
-            # Check return eligibility
-            eligibility = self._check_return_eligibility(order)
+            # Fetch the return policy and today's date once, sharing both with the eligibility check
+            today = date.today()
+            policy = cached_get_policy("return")
+            eligibility = self._check_return_eligibility(order, self._parse_date(order.get("order_date")), today, policy)
             if not eligibility["eligible"]:
                 return {
                     "error": "Return not eligible",
                     "reason": eligibility["reason"]
                 }
             
-            # Get return policy
-            policy = get_policy("return")
-            
             # Generate return authorization
-            auth_number = f"RMA-{order_id}-{datetime.now().strftime('%Y%m%d')}"
+            auth_number = f"RMA-{order_id}-{today.strftime('%Y%m%d')}"
             
             # Determine if restocking fee applies
+            price = order["price"]
             free_return = reason.lower() in policy["free_return_reasons"]
-            restocking_fee = 0 if free_return else order["price"] * policy["restocking_fee"]
+            restocking_fee = 0 if free_return else price * policy["restocking_fee"]
             
             result = {
                 "authorization_number": auth_number,
@@ -93,54 +112,58 @@ class OrderTools:
                 "restocking_fee": restocking_fee,
                 "free_return": free_return,
                 "process_steps": policy["process"],
-                "estimated_refund": order["price"] - restocking_fee
+                "estimated_refund": price - restocking_fee
             }
             
-            logger.info(f"Initiated return for order {order_id} with RMA {auth_number}")
+            await order_cache.invalidate(order_id)
+            
+            logger.info("Initiated return for order %s with RMA %s", order_id, auth_number)
             return result
             
         except Exception as e:
-            logger.error(f"Error initiating return for {order_id}: {e}")
+            logger.error("Error initiating return for %s: %s", order_id, e)
             return {"error": str(e)}
     
     async def track_shipment(self, order_id: str) -> Dict[str, Any]:
         """Get shipment tracking information."""
         try:
-            order = get_order(order_id)
+            order = await order_cache.get_order(order_id)
             if not order:
                 return {"error": "Order not found"}
             
+            status = order["status"]
+            
             # Mock tracking information
             tracking_info = {
                 "order_id": order_id,
-                "status": order["status"],
-                "tracking_number": f"TRK{order_id}2024",
-                "carrier": "FastShip Express",
+                "status": status,
+                "tracking_number": _TRACKING_NUMBER(order_id),
+                "carrier": _CARRIER,
                 "shipped_date": order.get("order_date"),
                 "expected_delivery": order.get("delivery_date"),
-                "current_location": self._get_mock_location(order["status"]),
-                "delivery_attempts": 0 if order["status"] != "delivered" else 1
+                "current_location": self._get_mock_location(status),
+                "delivery_attempts": 0 if status != "delivered" else 1
             }
             
             # Add status-specific information
-            if order["status"] == "delivered":
+            if status == "delivered":
                 tracking_info["delivered_date"] = order["delivery_date"]
-                tracking_info["signed_by"] = "Resident"
-            elif order["status"] == "shipped":
+                tracking_info["signed_by"] = _SIGNED_BY
+            elif status == "shipped":
                 tracking_info["estimated_delivery"] = order["delivery_date"]
                 tracking_info["in_transit"] = True
             
-            logger.info(f"Retrieved tracking info for order {order_id}")
+            logger.info("Retrieved tracking info for order %s", order_id)
             return tracking_info
             
         except Exception as e:
-            logger.error(f"Error tracking shipment for {order_id}: {e}")
+            logger.error("Error tracking shipment for %s: %s", order_id, e)
             return {"error": str(e)}
     
     async def modify_order(self, order_id: str, modifications: Dict[str, Any]) -> Dict[str, Any]:
         """Attempt to modify an existing order."""
         try:
-            order = get_order(order_id)
+            order = await order_cache.get_order(order_id)
             if not order:
                 return {"error": "Order not found"}
             
@@ -160,43 +183,47 @@ class OrderTools:
                 "confirmation_needed": True
             }
             
-            logger.info(f"Modification requested for order {order_id}")
+            await order_cache.invalidate(order_id)
+            
+            logger.info("Modification requested for order %s", order_id)
             return result
             
         except Exception as e:
-            logger.error(f"Error modifying order {order_id}: {e}")
+            logger.error("Error modifying order %s: %s", order_id, e)
             return {"error": str(e)}
     
-    def _calculate_order_age(self, order_date: str) -> int:
-        """Calculate the age of an order in days."""
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[date]:
+        """Parse a YYYY-MM-DD order date, returning None if it is missing or malformed."""
         try:
-            order_dt = datetime.strptime(order_date, "%Y-%m-%d")
-            return (datetime.now() - order_dt).days
-        except:
-            return 0
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
     
-    def _check_warranty_status(self, order: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_order_age(self, order_dt: Optional[date], today: date) -> int:
+        """Calculate the age of an order in days."""
+        return (today - order_dt).days if order_dt else 0
+    
+    def _check_warranty_status(self, expires_dt: Optional[date], today: date) -> Dict[str, Any]:
         """Check if warranty is still active."""
-        try:
-            warranty_expires = order.get("warranty_expires")
-            if not warranty_expires:
-                return {"is_active": False, "days_remaining": 0}
-            
-            expire_date = datetime.strptime(warranty_expires, "%Y-%m-%d")
-            days_remaining = (expire_date - datetime.now()).days
-            
-            return {
-                "is_active": days_remaining > 0,
-                "days_remaining": max(0, days_remaining)
-            }
-        except:
+        if not expires_dt:
             return {"is_active": False, "days_remaining": 0}
+        
+        # One subtraction feeds both fields; no max() builtin call
+        days_remaining = (expires_dt - today).days
+        is_active = days_remaining > 0
+        
+        return {
+            "is_active": is_active,
+            "days_remaining": days_remaining if is_active else 0
+        }
     
-    def _check_return_eligibility(self, order: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_return_eligibility(self, order: Dict[str, Any], order_dt: Optional[date], today: date,
+                                  policy: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
         """Check if order is eligible for return."""
         try:
-            order_age = self._calculate_order_age(order["order_date"])
-            policy = get_policy("return")
+            order_age = self._calculate_order_age(order_dt, today)
+            policy = policy or cached_get_policy("return")
             
             if order_age > policy["period_days"]:
                 return {
@@ -211,27 +238,21 @@ class OrderTools:
                 }
             
             # Calculate deadline
-            order_date = datetime.strptime(order["order_date"], "%Y-%m-%d")
-            deadline = order_date + timedelta(days=policy["period_days"])
+            deadline = order_dt + timedelta(days=policy["period_days"])
             
             return {
                 "eligible": True,
-                "deadline": deadline.strftime("%Y-%m-%d"),
+                "deadline": deadline,
                 "days_remaining": policy["period_days"] - order_age
             }
             
         except Exception as e:
-            logger.error(f"Error checking return eligibility: {e}")
+            logger.error("Error checking return eligibility: %s", e)
             return {"eligible": False, "reason": "Unable to determine eligibility"}
     
     def _get_mock_location(self, status: str) -> str:
         """Get mock current location based on order status."""
-        locations = {
-            "processing": "Fulfillment Center",
-            "shipped": "In Transit - Regional Hub",
-            "delivered": "Delivered to Address"
-        }
-        return locations.get(status, "Unknown")
+        return _LOCATIONS.get(status, "Unknown")
 
 # Global order tools instance
 order_tools = OrderTools()
\ No newline at end of file
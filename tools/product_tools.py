@@ -1,14 +1,155 @@
 """Product management and comparison tools."""
 
+import heapq
 import logging
-from typing import Dict, Any, List, Optional
-from data.mock_data import get_product, get_all_products
+from bisect import bisect_right
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from data.mock_data import get_product, get_products_bulk, get_all_products
 
 logger = logging.getLogger(__name__)
 
+# Customer use case -> the category that serves it best; the versatile categories are a fallback for any use case
+_USE_CASE_CATEGORIES = {
+    "gaming": "gaming",
+    "business": "professional",
+    "student": "budget",
+    "travel": "ultrabook"
+}
+_VERSATILE_CATEGORIES = frozenset(["professional", "ultrabook"])
+
+# Tier thresholds for bisect_right: a value lands in the label after the last bin it reaches
+_AVAILABILITY_BINS = (1, 10, 50)
+_AVAILABILITY_LABELS = ("Out of Stock", "Low Stock", "Limited Stock", "In Stock")
+_PRICE_TIER_BINS = (700, 1200, 1800)
+_PRICE_TIER_LABELS = ("Budget", "Mid-Range", "Premium", "High-End")
+_RESTOCK_BINS = (1, 10)
+_RESTOCK_LABELS = ("2-4 weeks", "1-2 weeks", "No restock needed")
+
+def _pairwise_similarity(prices: np.ndarray, cats: np.ndarray, spec_match: np.ndarray) -> np.ndarray:
+    """Similarity of every product pair (category, price and spec overlap), row i scoring against product i."""
+    # Price term first, built in place over two N x N buffers instead of a temporary per operator
+    row_prices, col_prices = prices[:, None], prices[None, :]
+    price_max = np.maximum(col_prices, row_prices)
+    score = np.subtract(col_prices, row_prices)
+    np.abs(score, out=score)
+    np.divide(score, price_max, out=score)
+    np.subtract(1, score, out=score)
+    score *= 0.3
+    
+    np.add(score, 0.4, out=score, where=cats[:, None] == cats[None, :])
+    np.multiply(spec_match, 0.3, out=price_max)  # reuse the buffer for the spec term
+    score += price_max
+    return np.minimum(score, 1.0, out=score)
+
 class ProductTools:
     """Tools for product information and comparison."""
     
+    # Everything below is built once per catalog load; per-request paths only read it
+    __slots__ = (
+        "_all_products", "_ids", "_index", "_categories_lc", "_by_category",
+        "_category_codes", "_cat_codes", "_prices", "_use_case_fallback", "_use_case_scores",
+        "_spec_match", "_sim_matrix", "_derived"
+    )
+    
+    def __init__(self):
+        self._build_catalog()
+        self._ensure_derived()
+    
+    def invalidate_cache(self):
+        """Rebuild the catalog arrays and derived fields, e.g. after prices or inventory change."""
+        self._build_catalog()
+        self._ensure_derived()
+    
+    def _ensure_derived(self):
+        """Precompute the per-product fields derived from inventory and price."""
+        self._derived = {pid: self._derive(product) for pid, product in self._all_products.items()}
+    
+    def _derive(self, product: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute one product's derived fields."""
+        inventory = product["inventory"]
+        return {
+            "availability_status": self._get_availability_status(inventory),
+            "price_tier": self._classify_price_tier(product["price"]),
+            "estimated_restock": self._estimate_restock(inventory),
+            "backorder_available": inventory < 10
+        }
+    
+    @staticmethod
+    def _listing(product_id: str, product: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+        """A response copy of a catalog product tagged with its id and any per-request fields."""
+        return {**product, "product_id": product_id, **fields}
+    
+    def _derived_for(self, product_id: str, product: Dict[str, Any]) -> Dict[str, Any]:
+        """Cached derived fields for a product, computed on the spot if it joined the catalog later."""
+        derived = self._derived.get(product_id)
+        return derived if derived is not None else self._derive(product)
+    
+    def _build_catalog(self):
+        """Lay the catalog out as parallel arrays (one slot per product) for vectorized scoring."""
+        catalog = get_all_products()
+        products = list(catalog.values())
+        
+        self._all_products = catalog
+        self._ids = tuple(catalog)
+        self._index = {pid: i for i, pid in enumerate(self._ids)}
+        
+        # Lowercased categories, normalized once per build and shared by the index and use-case scores
+        self._categories_lc = [p.get("category", "").lower() for p in products]
+        
+        # Lowercased category -> product ids, best rated first and cheapest among equal ratings
+        by_category: Dict[str, List[str]] = {}
+        for pid, category_lc in zip(self._ids, self._categories_lc):
+            by_category.setdefault(category_lc, []).append(pid)
+        self._by_category: Dict[str, Tuple[str, ...]] = {
+            category_lc: tuple(sorted(pids, key=lambda pid: (-catalog[pid]["rating"], catalog[pid]["price"])))
+            for category_lc, pids in by_category.items()
+        }
+        
+        self._category_codes: Dict[Any, int] = {}
+        self._cat_codes = np.asarray(
+            [self._category_codes.setdefault(p.get("category"), len(self._category_codes)) for p in products],
+            dtype=np.int16
+        )
+        self._prices = np.asarray([p["price"] for p in products], dtype=np.float64)
+        
+        # Use-case match per product: 1.0 in the use case's own category, 0.6 in a versatile one, else 0
+        lowered = self._categories_lc
+        self._use_case_fallback = np.asarray([c in _VERSATILE_CATEGORIES for c in lowered], dtype=bool) * 0.6
+        self._use_case_scores = {
+            use_case: np.where(np.asarray([c == target for c in lowered], dtype=bool), 1.0, self._use_case_fallback)
+            for use_case, target in _USE_CASE_CATEGORIES.items()
+        }
+        
+        # Spec keys and (key, value) pairs as indicator columns over a shared vocabulary
+        key_cols: Dict[str, int] = {}
+        pair_cols: Dict[tuple, int] = {}
+        key_cells, pair_cells = [], []
+        for row, product in enumerate(products):
+            for key, value in product.get("specs", {}).items():
+                key_cells.append((row, key_cols.setdefault(key, len(key_cols))))
+                pair_cells.append((row, pair_cols.setdefault((key, value), len(pair_cols))))
+        
+        count = len(products)
+        has_key = np.zeros((count, len(key_cols)))
+        has_pair = np.zeros((count, len(pair_cols)))
+        if key_cells:
+            has_key[tuple(zip(*key_cells))] = 1
+            has_pair[tuple(zip(*pair_cells))] = 1
+        
+        # Pairwise share of matching spec values (0 when no keys are shared); the catalog is small, so a dense
+        # matrix is cheapest. The products count shared keys and equal (key, value) pairs exactly.
+        common = has_key @ has_key.T
+        self._spec_match = np.divide(has_pair @ has_pair.T, common, out=np.zeros((count, count)), where=common > 0)
+        
+        # Full similarity matrix, so alternatives are a row lookup instead of a rescoring pass
+        self._sim_matrix = _pairwise_similarity(self._prices, self._cat_codes, self._spec_match)
+        
+        # Read-only from here on, so request paths can share the arrays without defensive copies
+        for array in (self._cat_codes, self._prices, self._use_case_fallback, self._spec_match, self._sim_matrix,
+                      *self._use_case_scores.values()):
+            array.setflags(write=False)
+    
     async def get_product_info(self, product_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed product information."""
         try:
@@ -17,9 +158,12 @@ class ProductTools:
                 return None
             
             # Add calculated fields
-            product_info = product.copy()
-            product_info["availability_status"] = self._get_availability_status(product["inventory"])
-            product_info["price_tier"] = self._classify_price_tier(product["price"])
+            derived = self._derived_for(product_id, product)
+            product_info = {
+                **product,
+                "availability_status": derived["availability_status"],
+                "price_tier": derived["price_tier"]
+            }
             
             logger.info(f"Retrieved product info for {product_id}")
             return product_info
@@ -31,12 +175,7 @@ class ProductTools:
     async def compare_products(self, product_ids: List[str]) -> Dict[str, Any]:
         """Compare multiple products side by side."""
         try:
-            products = {}
-            
-            for product_id in product_ids:
-                product = get_product(product_id)
-                if product:
-                    products[product_id] = product
+            products = get_products_bulk(product_ids)
             
             if not products:
                 return {"error": "No valid products found for comparison"}
@@ -62,13 +201,14 @@ class ProductTools:
             if not product:
                 return {"error": "Product not found"}
             
+            derived = self._derived_for(product_id, product)
             inventory_info = {
                 "product_id": product_id,
                 "product_name": product["name"],
                 "current_stock": product["inventory"],
-                "availability_status": self._get_availability_status(product["inventory"]),
-                "estimated_restock": self._estimate_restock(product["inventory"]),
-                "backorder_available": product["inventory"] < 10
+                "availability_status": derived["availability_status"],
+                "estimated_restock": derived["estimated_restock"],
+                "backorder_available": derived["backorder_available"]
             }
             
             logger.info(f"Checked inventory for {product_id}: {product['inventory']} units")
@@ -85,26 +225,30 @@ class ProductTools:
             if not target_product:
                 return []
             
-            all_products = get_all_products()
-            alternatives = []
+            idx = self._index.get(product_id)
+            if idx is None:
+                return []
             
-            for pid, product in all_products.items():
-                if pid == product_id:
-                    continue
-                
-                similarity_score = self._calculate_similarity(target_product, product, criteria)
-                if similarity_score > 0.3:  # Threshold for relevance
-                    alt_product = product.copy()
-                    alt_product["product_id"] = pid
-                    alt_product["similarity_score"] = similarity_score
-                    alt_product["key_differences"] = self._identify_differences(target_product, product)
-                    alternatives.append(alt_product)
+            # Score the whole catalog at once, drop the product itself and anything under the relevance threshold
+            scores = self._sim_matrix[idx].copy()
+            scores[idx] = -1.0
+            candidates = np.flatnonzero(scores > 0.3)
             
-            # Sort by similarity score
-            alternatives.sort(key=lambda x: x["similarity_score"], reverse=True)
+            # Top 5 by similarity off a 5-element heap rather than a full sort; ties keep catalog order
+            top = heapq.nlargest(5, candidates.tolist(), key=scores.item)
+            
+            alternatives = []
+            for i in top:
+                pid = self._ids[i]
+                product = self._all_products[pid]
+                alternatives.append(self._listing(
+                    pid, product,
+                    similarity_score=float(scores[i]),
+                    key_differences=self._identify_differences(target_product, product)
+                ))
             
             logger.info(f"Found {len(alternatives)} alternatives for {product_id}")
-            return alternatives[:5]  # Return top 5
+            return alternatives
             
         except Exception as e:
             logger.error(f"Error finding alternatives for {product_id}: {e}")
@@ -113,17 +257,11 @@ class ProductTools:
     async def search_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Search products by category."""
         try:
-            all_products = get_all_products()
-            category_products = []
-            
-            for product_id, product in all_products.items():
-                if product.get("category", "").lower() == category.lower():
-                    product_info = product.copy()
-                    product_info["product_id"] = product_id
-                    category_products.append(product_info)
-            
-            # Sort by rating and price
-            category_products.sort(key=lambda x: (-x["rating"], x["price"]))
+            # Ids are kept sorted by rating and price, so only the listings need building
+            category_products = [
+                self._listing(product_id, self._all_products[product_id])
+                for product_id in self._by_category.get(category.lower(), ())
+            ]
             
             logger.info(f"Found {len(category_products)} products in category {category}")
             return category_products
@@ -135,23 +273,24 @@ class ProductTools:
     async def get_recommendations(self, customer_needs: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get product recommendations based on customer needs."""
         try:
-            all_products = get_all_products()
-            recommendations = []
+            score = self._need_match_vec(customer_needs)
+            candidates = np.flatnonzero(score > 0.5)  # Threshold for recommendation
             
-            for product_id, product in all_products.items():
-                match_score = self._calculate_need_match(product, customer_needs)
-                if match_score > 0.5:  # Threshold for recommendation
-                    rec_product = product.copy()
-                    rec_product["product_id"] = product_id
-                    rec_product["match_score"] = match_score
-                    rec_product["why_recommended"] = self._explain_recommendation(product, customer_needs)
-                    recommendations.append(rec_product)
+            # Top 3 by match score off a 3-element heap rather than a full sort; ties keep catalog order
+            top = heapq.nlargest(3, candidates.tolist(), key=score.item)
             
-            # Sort by match score
-            recommendations.sort(key=lambda x: x["match_score"], reverse=True)
+            recommendations = []
+            for i in top:
+                product_id = self._ids[i]
+                product = self._all_products[product_id]
+                recommendations.append(self._listing(
+                    product_id, product,
+                    match_score=float(score[i]),
+                    why_recommended=self._explain_recommendation(product, customer_needs)
+                ))
             
-            logger.info(f"Generated {len(recommendations)} recommendations")
-            return recommendations[:3]  # Return top 3
+            logger.info(f"Generated {len(candidates)} recommendations")
+            return recommendations
             
         except Exception as e:
             logger.error(f"Error generating recommendations: {e}")
@@ -159,34 +298,15 @@ class ProductTools:
     
     def _get_availability_status(self, inventory: int) -> str:
         """Determine availability status based on inventory level."""
-        if inventory >= 50:
-            return "In Stock"
-        elif inventory >= 10:
-            return "Limited Stock"
-        elif inventory > 0:
-            return "Low Stock"
-        else:
-            return "Out of Stock"
+        return _AVAILABILITY_LABELS[bisect_right(_AVAILABILITY_BINS, inventory)]
     
     def _classify_price_tier(self, price: float) -> str:
         """Classify product into price tier."""
-        if price < 700:
-            return "Budget"
-        elif price < 1200:
-            return "Mid-Range"
-        elif price < 1800:
-            return "Premium"
-        else:
-            return "High-End"
+        return _PRICE_TIER_LABELS[bisect_right(_PRICE_TIER_BINS, price)]
     
     def _estimate_restock(self, inventory: int) -> str:
         """Estimate restock timeline based on current inventory."""
-        if inventory >= 10:
-            return "No restock needed"
-        elif inventory > 0:
-            return "1-2 weeks"
-        else:
-            return "2-4 weeks"
+        return _RESTOCK_LABELS[bisect_right(_RESTOCK_BINS, inventory)]
     
     def _create_comparison_matrix(self, products: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Create a comparison matrix for products."""
@@ -228,28 +348,6 @@ class ProductTools:
         
         return recommendations
     
-    def _calculate_similarity(self, product1: Dict[str, Any], product2: Dict[str, Any], criteria: str) -> float:
-        """Calculate similarity score between two products."""
-        score = 0.0
-        
-        # Category match
-        if product1.get("category") == product2.get("category"):
-            score += 0.4
-        
-        # Price range similarity
-        price_diff = abs(product1["price"] - product2["price"]) / max(product1["price"], product2["price"])
-        score += (1 - price_diff) * 0.3
-        
-        # Specs similarity (simplified)
-        specs1 = product1.get("specs", {})
-        specs2 = product2.get("specs", {})
-        common_specs = set(specs1.keys()) & set(specs2.keys())
-        if common_specs:
-            spec_matches = sum(1 for spec in common_specs if specs1[spec] == specs2[spec])
-            score += (spec_matches / len(common_specs)) * 0.3
-        
-        return min(score, 1.0)
-    
     def _identify_differences(self, product1: Dict[str, Any], product2: Dict[str, Any]) -> List[str]:
         """Identify key differences between products."""
         differences = []
@@ -268,42 +366,28 @@ class ProductTools:
         
         return differences
     
-    def _calculate_need_match(self, product: Dict[str, Any], needs: Dict[str, Any]) -> float:
-        """Calculate how well a product matches customer needs."""
-        score = 0.0
+    def _need_match_vec(self, needs: Dict[str, Any]) -> np.ndarray:
+        """How well every product matches the customer's needs, as the mean of the criteria given."""
+        score = np.zeros(len(self._ids))
         total_criteria = 0
         
-        # Budget match
+        # Budget match: full marks within budget, half within 20% over it
         if "max_budget" in needs:
             total_criteria += 1
-            if product["price"] <= needs["max_budget"]:
-                score += 1.0
-            elif product["price"] <= needs["max_budget"] * 1.2:  # Within 20%
-                score += 0.5
+            budget = needs["max_budget"]
+            score += np.where(self._prices <= budget, 1.0, np.where(self._prices <= budget * 1.2, 0.5, 0.0))
         
         # Category preference
         if "preferred_category" in needs:
             total_criteria += 1
-            if product.get("category") == needs["preferred_category"]:
-                score += 1.0
+            code = self._category_codes.get(needs["preferred_category"])
+            if code is not None:
+                score += self._cat_codes == code
         
         # Use case match (simplified)
         if "use_case" in needs:
             total_criteria += 1
-            use_case = needs["use_case"].lower()
-            category = product.get("category", "").lower()
-            
-            match_map = {
-                "gaming": "gaming",
-                "business": "professional",
-                "student": "budget",
-                "travel": "ultrabook"
-            }
-            
-            if match_map.get(use_case) == category:
-                score += 1.0
-            elif category in ["professional", "ultrabook"]:  # Versatile options
-                score += 0.6
+            score += self._use_case_scores.get(needs["use_case"].lower(), self._use_case_fallback)
         
         return score / max(total_criteria, 1)
     
@@ -3,12 +3,21 @@
 import asyncio
 import aiohttp
 import logging
-from typing import List, Dict, Any, Optional
+import weakref
+from typing import List, Dict, Any, Optional, Tuple, Union
 import google.generativeai as genai
-from config import GEMINI_API_KEY, GEMINI_MODEL
+from utils.ttl_cache import TTLCache
+from config import GEMINI_API_KEY, GEMINI_MODEL, SEARCH_MAX_CONCURRENCY, SEARCH_CACHE_TTL
 
 logger = logging.getLogger(__name__)
 
+# Search kinds accepted by run_searches, mapped to the label used when logging failures
+_SEARCH_KINDS = {
+    "web": "Web search",
+    "deals": "Deals search",
+    "competitors": "Competitor search"
+}
+
 class SearchTools:
     """Tools for web search using Gemini API."""
     
@@ -19,46 +28,89 @@ class SearchTools:
         else:
             logger.warning("Gemini API key not configured - search will use mock responses")
             self.model = None
+        
+        # Gemini answers by (kind, lowercased text); failures fall back to mocks and are not cached
+        self._cache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+        
+        # One Gemini concurrency limit shared by all searches on a loop (asyncio primitives are bound to their loop)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
     
     async def search_web(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """Search the web for current information."""
+        return (await self.run_searches([("web", query)]))[0]
+    
+    async def find_deals(self, product_type: str) -> List[Dict[str, Any]]:
+        """Search for current deals on specific product types."""
+        return (await self.run_searches([("deals", product_type)]))[0]
+    
+    async def search_competitors(self, product: str) -> List[Dict[str, Any]]:
+        """Search for competitor information and alternatives."""
+        return (await self.run_searches([("competitors", product)]))[0]
+    
+    async def run_searches(self, queries: List[Tuple[str, str]]) -> List[List[Dict[str, Any]]]:
+        """Run several (kind, text) searches concurrently; kind is "web", "deals" or "competitors"."""
+        for kind, _ in queries:
+            if kind not in _SEARCH_KINDS:
+                raise ValueError(f"Unknown search kind: {kind}")
+        
         if not self.model:
-            return self._mock_web_search(query)
+            return [self._mock_search(kind, text) for kind, text in queries]
         
-        try:
-            # Use Gemini to search and summarize web information
-            search_prompt = f"""
-            Search for current information about: {query}
+        # Answer repeats from the cache and send each distinct miss to Gemini once
+        keys = [(kind, text.lower()) for kind, text in queries]
+        results = [self._cache.get(key) for key in keys]
+        misses = {}
+        for i, key in enumerate(keys):
+            if results[i] is None:
+                misses.setdefault(key, []).append(i)
+        
+        if misses:
+            pending = [queries[indexes[0]] for indexes in misses.values()]
+            outputs = await self._batch_generate([self._search_prompt(kind, text) for kind, text in pending])
+            
+            for (kind, text), indexes, output in zip(pending, misses.values(), outputs):
+                if isinstance(output, Exception):
+                    logger.error("%s failed: %s", _SEARCH_KINDS[kind], output)
+                    result = self._mock_search(kind, text)
+                else:
+                    result = self._search_result(kind, text, output)
+                    self._cache.set(keys[indexes[0]], result)
+                for i in indexes:
+                    results[i] = result
+        return results
+    
+    async def _batch_generate(self, prompts: List[str]) -> List[Union[str, Exception]]:
+        """Generate text for each prompt, keeping at most SEARCH_MAX_CONCURRENCY calls in flight across all searches."""
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(SEARCH_MAX_CONCURRENCY)
+        return await asyncio.gather(*(self._one(prompt, sem) for prompt in prompts))
+    
+    async def _one(self, prompt: str, sem: asyncio.Semaphore) -> Union[str, Exception]:
+        """Generate text for one prompt, returning the exception instead of raising it."""
+        async with sem:
+            try:
+                response = await asyncio.to_thread(self.model.generate_content, prompt)
+                return response.text
+            except Exception as e:
+                return e
+    
+    def _search_prompt(self, kind: str, text: str) -> str:
+        """Build the Gemini prompt for a search."""
+        if kind == "web":
+            return f"""
+            Search for current information about: {text}
             
             Please provide relevant, up-to-date information in a structured format.
             Focus on factual, helpful information that would be useful for customer service.
             
             Format your response as a summary of key points.
             """
-            
-            response = await asyncio.to_thread(
-                self.model.generate_content, search_prompt
-            )
-            
-            return [{
-                "title": "Web Search Results",
-                "content": response.text,
-                "source": "Gemini AI Search",
-                "relevance": 0.9
-            }]
-            
-        except Exception as e:
-            logger.error(f"Web search failed: {e}")
-            return self._mock_web_search(query)
-    
-    async def find_deals(self, product_type: str) -> List[Dict[str, Any]]:
-        """Search for current deals on specific product types."""
-        if not self.model:
-            return self._mock_deals_search(product_type)
         
-        try:
-            deals_prompt = f"""
-            Find current deals and promotions for {product_type}.
+        if kind == "deals":
+            return f"""
+            Find current deals and promotions for {text}.
             Look for:
             - Price comparisons
             - Current promotions
@@ -67,30 +119,9 @@ class SearchTools:
             
             Provide practical information that would help a customer make a purchasing decision.
             """
-            
-            response = await asyncio.to_thread(
-                self.model.generate_content, deals_prompt
-            )
-            
-            return [{
-                "title": f"Current Deals for {product_type}",
-                "content": response.text,
-                "source": "Gemini AI Search",
-                "deal_type": "general"
-            }]
-            
-        except Exception as e:
-            logger.error(f"Deals search failed: {e}")
-            return self._mock_deals_search(product_type)
-    
-    async def search_competitors(self, product: str) -> List[Dict[str, Any]]:
-        """Search for competitor information and alternatives."""
-        if not self.model:
-            return self._mock_competitor_search(product)
         
-        try:
-            competitor_prompt = f"""
-            Find information about alternatives and competitors for {product}.
+        return f"""
+            Find information about alternatives and competitors for {text}.
             Include:
             - Similar products from other brands
             - Price comparisons
@@ -99,21 +130,39 @@ class SearchTools:
             
             Focus on helping customers understand their options.
             """
-            
-            response = await asyncio.to_thread(
-                self.model.generate_content, competitor_prompt
-            )
-            
+    
+    def _search_result(self, kind: str, text: str, content: str) -> List[Dict[str, Any]]:
+        """Wrap generated text in the result shape for a search kind."""
+        if kind == "web":
             return [{
-                "title": f"Alternatives to {product}",
-                "content": response.text,
+                "title": "Web Search Results",
+                "content": content,
                 "source": "Gemini AI Search",
-                "comparison_type": "competitive_analysis"
+                "relevance": 0.9
             }]
-            
-        except Exception as e:
-            logger.error(f"Competitor search failed: {e}")
-            return self._mock_competitor_search(product)
+        
+        if kind == "deals":
+            return [{
+                "title": f"Current Deals for {text}",
+                "content": content,
+                "source": "Gemini AI Search",
+                "deal_type": "general"
+            }]
+        
+        return [{
+            "title": f"Alternatives to {text}",
+            "content": content,
+            "source": "Gemini AI Search",
+            "comparison_type": "competitive_analysis"
+        }]
+    
+    def _mock_search(self, kind: str, text: str) -> List[Dict[str, Any]]:
+        """Mock results for a search kind when the API is unavailable or fails."""
+        if kind == "web":
+            return self._mock_web_search(text)
+        if kind == "deals":
+            return self._mock_deals_search(text)
+        return self._mock_competitor_search(text)
     
     def _mock_web_search(self, query: str) -> List[Dict[str, Any]]:
         """Mock web search results when API is not available."""
@@ -1,8 +1,102 @@
 """Response formatters and utilities."""
 
-from typing import Dict, Any, List, Optional
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+# (epoch second, isoformat string) of the last timestamp handed out
+_ts_cache: List[Any] = [0, ""]
+
+def _now_iso() -> str:
+    """Return the current local time as an ISO string, reformatted at most once per second."""
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        # Build the string before publishing the second so concurrent readers never see a stale pair
+        stamp = datetime.fromtimestamp(t).isoformat()
+        _ts_cache[1], _ts_cache[0] = stamp, t
+    return _ts_cache[1]
+
+# Static API payloads, built once at import instead of on every request
+_AGENTS_PAYLOAD: Dict[str, Any] = {
+    "available_agents": {
+        "orchestrator": {
+            "name": "Orchestrator",
+            "description": "Main coordinator that manages all specialist agents",
+            "capabilities": ["Multi-agent coordination", "Response synthesis", "Plan execution"]
+        },
+        "order": {
+            "name": "Order Specialist",
+            "description": "Handles order tracking, modifications, returns, and warranty issues",
+            "capabilities": ["Order lookup", "Tracking information", "Returns processing", "Warranty checks"]
+        },
+        "tech_support": {
+            "name": "Technical Support",
+            "description": "Provides troubleshooting and technical assistance",
+            "capabilities": ["Hardware troubleshooting", "Software issues", "Setup guidance", "Performance optimization"]
+        },
+        "product": {
+            "name": "Product Expert",
+            "description": "Offers product information, comparisons, and recommendations",
+            "capabilities": ["Product specifications", "Comparisons", "Recommendations", "Inventory checks"]
+        },
+        "solutions": {
+            "name": "Solutions Specialist", 
+            "description": "Handles returns, exchanges, and problem resolution",
+            "capabilities": ["Returns processing", "Exchange requests", "Compensation decisions", "Problem resolution"]
+        }
+    },
+    "execution_modes": [
+        {
+            "mode": "sequential",
+            "description": "Agents execute one after another, sharing context"
+        },
+        {
+            "mode": "parallel", 
+            "description": "Multiple agents work simultaneously for faster response"
+        },
+        {
+            "mode": "conditional",
+            "description": "Agents execute based on dependencies and conditions"
+        }
+    ]
+}
+
+_DEMO_PAYLOAD: Dict[str, Any] = {
+    "scenario": "Customer Technical Support with Order Context",
+    "customer_message": "My laptop order #12345 won't turn on, I need help!",
+    "expected_flow": [
+        {
+            "step": 1,
+            "agent": "Order Agent",
+            "action": "Retrieve order #12345 details and warranty information"
+        },
+        {
+            "step": 2, 
+            "agent": "Tech Support Agent",
+            "action": "Provide troubleshooting steps for laptop power issues"
+        },
+        {
+            "step": 3,
+            "agent": "Solutions Agent", 
+            "action": "Offer resolution options (repair, replacement, refund)"
+        },
+        {
+            "step": 4,
+            "agent": "Orchestrator",
+            "action": "Synthesize all responses into coherent customer support answer"
+        }
+    ],
+    "demonstration_features": [
+        "Multi-agent coordination",
+        "Context sharing between agents",
+        "Tool usage (order lookup, knowledge base, troubleshooting)",
+        "Intelligent response synthesis",
+        "Real-time execution planning"
+    ]
+}
+
 def format_chat_response(orchestrator_result: Dict[str, Any]) -> Dict[str, Any]:
     """Format the orchestrator result for the chat API response."""
     
@@ -14,7 +108,7 @@ def format_chat_response(orchestrator_result: Dict[str, Any]) -> Dict[str, Any]:
         "confidence": orchestrator_result.get("confidence", 0.5),
         "thinking_process": orchestrator_result.get("thinking_process", ""),
         "execution_time": orchestrator_result.get("execution_time", 0),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     }
 
 def format_session_response(session_id: str, conversation_history: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -28,90 +122,14 @@ def format_session_response(session_id: str, conversation_history: List[Dict[str
     }
 
 def format_agents_response() -> Dict[str, Any]:
-    """Format the agents information for the agents API response."""
+    """Format the agents information for the agents API response (shared payload; do not mutate)."""
     
-    return {
-        "available_agents": {
-            "orchestrator": {
-                "name": "Orchestrator",
-                "description": "Main coordinator that manages all specialist agents",
-                "capabilities": ["Multi-agent coordination", "Response synthesis", "Plan execution"]
-            },
-            "order": {
-                "name": "Order Specialist",
-                "description": "Handles order tracking, modifications, returns, and warranty issues",
-                "capabilities": ["Order lookup", "Tracking information", "Returns processing", "Warranty checks"]
-            },
-            "tech_support": {
-                "name": "Technical Support",
-                "description": "Provides troubleshooting and technical assistance",
-                "capabilities": ["Hardware troubleshooting", "Software issues", "Setup guidance", "Performance optimization"]
-            },
-            "product": {
-                "name": "Product Expert",
-                "description": "Offers product information, comparisons, and recommendations",
-                "capabilities": ["Product specifications", "Comparisons", "Recommendations", "Inventory checks"]
-            },
-            "solutions": {
-                "name": "Solutions Specialist", 
-                "description": "Handles returns, exchanges, and problem resolution",
-                "capabilities": ["Returns processing", "Exchange requests", "Compensation decisions", "Problem resolution"]
-            }
-        },
-        "execution_modes": [
-            {
-                "mode": "sequential",
-                "description": "Agents execute one after another, sharing context"
-            },
-            {
-                "mode": "parallel", 
-                "description": "Multiple agents work simultaneously for faster response"
-            },
-            {
-                "mode": "conditional",
-                "description": "Agents execute based on dependencies and conditions"
-            }
-        ]
-    }
+    return _AGENTS_PAYLOAD
 
 def format_demo_response() -> Dict[str, Any]:
-    """Format the demo scenario response."""
+    """Format the demo scenario response (shared payload; do not mutate)."""
     
-    demo_scenario = {
-        "scenario": "Customer Technical Support with Order Context",
-        "customer_message": "My laptop order #12345 won't turn on, I need help!",
-        "expected_flow": [
-            {
-                "step": 1,
-                "agent": "Order Agent",
-                "action": "Retrieve order #12345 details and warranty information"
-            },
-            {
-                "step": 2, 
-                "agent": "Tech Support Agent",
-                "action": "Provide troubleshooting steps for laptop power issues"
-            },
-            {
-                "step": 3,
-                "agent": "Solutions Agent", 
-                "action": "Offer resolution options (repair, replacement, refund)"
-            },
-            {
-                "step": 4,
-                "agent": "Orchestrator",
-                "action": "Synthesize all responses into coherent customer support answer"
-            }
-        ],
-        "demonstration_features": [
-            "Multi-agent coordination",
-            "Context sharing between agents",
-            "Tool usage (order lookup, knowledge base, troubleshooting)",
-            "Intelligent response synthesis",
-            "Real-time execution planning"
-        ]
-    }
-    
-    return demo_scenario
+    return _DEMO_PAYLOAD
 
 def format_error_response(error_message: str, error_type: str = "general_error") -> Dict[str, Any]:
     """Format error responses consistently."""
@@ -120,7 +138,7 @@ def format_error_response(error_message: str, error_type: str = "general_error")
         "error": True,
         "error_type": error_type,
         "message": error_message,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _now_iso(),
         "suggestion": "Please try again or contact support if the issue persists"
     }
 
@@ -130,7 +148,7 @@ def format_success_response(message: str, data: Optional[Dict[str, Any]] = None)
     response = {
         "success": True,
         "message": message,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     }
     
     if data:
@@ -144,12 +162,13 @@ def truncate_response(text: str, max_length: int = 2000) -> str:
     if len(text) <= max_length:
         return text
     
-    # Try to truncate at a sentence boundary
+    # Try to truncate at a sentence boundary, only searching the tail where one would be kept
     truncated = text[:max_length]
+    tail_start = int(max_length * 0.7) + 1
     last_sentence_end = max(
-        truncated.rfind('.'),
-        truncated.rfind('!'),
-        truncated.rfind('?')
+        truncated.rfind('.', tail_start),
+        truncated.rfind('!', tail_start),
+        truncated.rfind('?', tail_start)
     )
     
     if last_sentence_end > max_length * 0.7:  # If we can keep at least 70% of the text
@@ -157,15 +176,18 @@ def truncate_response(text: str, max_length: int = 2000) -> str:
     else:
         return truncated + "..."
 
+@lru_cache(maxsize=256)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile one case-insensitive alternation for a keyword set, longest keywords first."""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, ordered)), re.IGNORECASE)
+
 def highlight_key_info(text: str, keywords: List[str]) -> str:
     """Highlight key information in the response text."""
     
-    # For terminal output, we can use simple formatting
-    highlighted = text
-    
-    for keyword in keywords:
-        if keyword.lower() in text.lower():
-            # Simple highlighting - in a real implementation, you might use rich text
-            highlighted = highlighted.replace(keyword, f"**{keyword}**")
+    keywords = tuple(keyword for keyword in keywords if keyword)
+    if not keywords:
+        return text
     
-    return highlighted
\ No newline at end of file
+    # For terminal output, we can use simple formatting; matches keep their original casing
+    return _keyword_pattern(keywords).sub(r"**\g<0>**", text)
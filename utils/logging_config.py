@@ -1,15 +1,112 @@
 """Logging configuration for the multi-agent customer care system."""
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import re
 import sys
-from datetime import datetime
+import time
+from functools import lru_cache
 from pathlib import Path
-from colorama import init, Fore, Style
+from typing import Callable, Optional
+from colorama import Fore, Style, just_fix_windows_console
+from config import LOG_LEVEL, LOG_QUEUE_SIZE
 
-# Initialize colorama for cross-platform colored output
-init()
+# Quiet third-party loggers, keep the demo components at INFO
+_LOGGER_LEVELS = {
+    "uvicorn": logging.WARNING,
+    "uvicorn.access": logging.WARNING,
+    "fastapi": logging.WARNING,
+    "httpx": logging.WARNING,
+    "openai": logging.WARNING,
+    "agents": logging.INFO,
+    "orchestrator": logging.INFO,
+    "planner": logging.INFO,
+    "tools": logging.INFO
+}
 
-class ColoredFormatter(logging.Formatter):
+# Background thread that owns the real handlers; application threads only enqueue records
+_listener = None
+
+# '%(field)s' / '%(field)-Ns' placeholders the fast path can compile; anything else uses the generic formatter
+_FIELD_RE = re.compile(r"%\((\w+)\)(-?\d*)s")
+_COMPILABLE_FIELDS = frozenset([
+    "asctime", "message", "name", "levelname", "levelno", "module", "funcName", "lineno",
+    "filename", "pathname", "process", "processName", "thread", "threadName"
+])
+
+# String fields that repeat across records (a handful of logger and level names), so their padding is memoized
+_PADDED_FIELDS = frozenset(["name", "levelname"])
+
+@lru_cache(maxsize=256)
+def _pad(value: str, spec: str) -> str:
+    """Pad a logger or level name to its column width, once per distinct name."""
+    return format(value, spec)
+
+def _compile_format(fmt: str) -> Optional[Callable[[logging.LogRecord, str], str]]:
+    """Compile a %-style log format into a function of (record, asctime), or None if it is not supported."""
+    template, pos = [], 0
+    namespace = {"_pad": _pad}  # pad specs are bound here by name rather than quoted into the source
+    for match in _FIELD_RE.finditer(fmt):
+        field, width = match.groups()
+        literal = fmt[pos:match.start()]
+        if "%" in literal or field not in _COMPILABLE_FIELDS:
+            return None
+        
+        value = "asctime" if field == "asctime" else f"record.{field}"
+        spec = f"{'<' if width.startswith('-') else '>'}{width.lstrip('-')}" if width else ""
+        template.append(literal.replace("{", "{{").replace("}", "}}"))
+        if spec and field in _PADDED_FIELDS:
+            spec_name = f"_s{len(namespace) - 1}"
+            namespace[spec_name] = spec
+            template.append(f"{{_pad({value}, {spec_name})}}")
+        else:
+            template.append(f"{{{value}!s{':' + spec if spec else ''}}}")
+        pos = match.end()
+    
+    literal = fmt[pos:]
+    if "%" in literal:
+        return None
+    template.append(literal.replace("{", "{{").replace("}", "}}"))
+    
+    # One f-string expression, e.g. f"{asctime} | {_pad(record.name, _s0)} | ..." for the app's layout
+    try:
+        return eval(f"lambda record, asctime: f{''.join(template)!r}", namespace)
+    except SyntaxError:
+        return None
+
+class FastFormatter(logging.Formatter):
+    """Formatter that compiles its format string once into a single f-string render function."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._time_cache = (None, "", None)  # (epoch second, formatted time, datefmt) of the last record
+        # StrFormatStyle and StringTemplateStyle subclass PercentStyle, so match the exact type
+        self._render = _compile_format(self._fmt) if type(self._style) is logging.PercentStyle else None
+        self._uses_time = self.usesTime()
+    
+    def formatTime(self, record, datefmt=None):
+        # Second-resolution formats render the same string for every record in that second
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached = self._time_cache
+        if cached[0] != second or cached[2] != datefmt:
+            cached = self._time_cache = (second, time.strftime(datefmt, self.converter(second)), datefmt)
+        return cached[1]
+    
+    def format(self, record):
+        # Unsupported formats and records with exception or stack info take the generic path
+        if self._render is None or record.exc_info or record.exc_text or record.stack_info:
+            return super().format(record)
+        
+        record.message = record.getMessage()
+        return self._render(record, self.formatTime(record, self.datefmt) if self._uses_time else "")
+
+class ColoredFormatter(FastFormatter):
     """Custom formatter that adds colors to log levels."""
     
     COLORS = {
@@ -20,79 +117,259 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': Fore.MAGENTA
     }
     
+    # Colored level names, built once instead of per record
+    COLORED_LEVELS = {level: f"{color}{level}{Style.RESET_ALL}" for level, color in COLORS.items()}
+    
     def format(self, record):
-        # Add color to levelname
-        levelname = record.levelname
-        if levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[levelname]}{levelname}{Style.RESET_ALL}"
+        plain_levelname, plain_name = record.levelname, record.name
+        
+        # Already colored by another formatter: don't wrap the codes twice
+        if plain_levelname.startswith('\x1b'):
+            return super().format(record)
+        
+        levelname = self.COLORED_LEVELS.get(plain_levelname, plain_levelname)
+        name = _color_name(plain_name)
+        if levelname is plain_levelname and name is plain_name:
+            return super().format(record)
+        
+        # Color in place and put the plain values back, so other handlers (e.g. the log file) see them
+        record.__dict__.update(levelname=levelname, name=name)
+        try:
+            return super().format(record)
+        finally:
+            record.__dict__.update(levelname=plain_levelname, name=plain_name)
+
+# Logger name colors by top-level package (planner lives in planning, the orchestrator in agents)
+_NAME_COLORS = {
+    'agents': Fore.BLUE,
+    'orchestrator': Fore.MAGENTA,
+    'planning': Fore.CYAN,
+    'planner': Fore.CYAN,
+    'tools': Fore.GREEN
+}
+
+@lru_cache(maxsize=256)
+def _color_name(logger_name: str) -> str:
+    """Color a logger name based on its component, memoized per name."""
+    color = _NAME_COLORS.get(logger_name.partition('.')[0])
+    return f"{color}{logger_name}{Style.RESET_ALL}" if color else logger_name
+
+class RawFileHandler(logging.Handler):
+    """Append-only file handler that batches encoded records and writes them with os.write, flushing on warnings."""
+    
+    BUFFER_SIZE = 1 << 20
+    terminator = "\n"
+    
+    def __init__(self, filename, encoding: str = "utf-8"):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self._fd = None  # opened on the first record, so nothing touches the disk until something is logged
+        self._buffer = bytearray()
+    
+    def _open(self) -> int:
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        # O_APPEND makes each write land at the end of the file, even with other writers appending too
+        return os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_CLOEXEC", 0), 0o644)
+    
+    def emit(self, record):
+        try:
+            self._buffer += (self.format(record) + self.terminator).encode(self.encoding, "backslashreplace")
+            if record.levelno >= logging.WARNING or len(self._buffer) >= self.BUFFER_SIZE:
+                self._write_buffer()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _write_buffer(self):
+        """Write out everything buffered; the caller holds the handler lock."""
+        if not self._buffer:
+            return
+        if self._fd is None:
+            self._fd = self._open()
         
-        # Add color to logger name based on component
-        logger_name = record.name
-        if 'agent' in logger_name:
-            record.name = f"{Fore.BLUE}{logger_name}{Style.RESET_ALL}"
-        elif 'orchestrator' in logger_name:
-            record.name = f"{Fore.MAGENTA}{logger_name}{Style.RESET_ALL}"
-        elif 'planner' in logger_name:
-            record.name = f"{Fore.CYAN}{logger_name}{Style.RESET_ALL}"
-        elif 'tools' in logger_name:
-            record.name = f"{Fore.GREEN}{logger_name}{Style.RESET_ALL}"
+        view = memoryview(self._buffer)
+        while view:
+            view = view[os.write(self._fd, view):]
+        view.release()
+        self._buffer.clear()
+    
+    def flush(self):
+        with self.lock:
+            self._write_buffer()
+    
+    def close(self):
+        with self.lock:
+            try:
+                self._write_buffer()
+            finally:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                super().close()
+
+# Not used by default: each run already gets its own timestamped log file. If size rotation is ever needed,
+# use this instead of RotatingFileHandler, whose per-record exists/isfile probes crawl on network filesystems.
+class CounterRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-based rotation that counts written bytes in memory instead of probing the file per record."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._written = None  # size of the current file, read once when first needed
+    
+    def emit(self, record):
+        # Format once and size the encoded record, rather than formatting again in shouldRollover
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # Size it in the encoding the stream really writes; self.encoding may be None or "locale"
+            if self._roll_for(len(msg.encode(self.stream.encoding, self.stream.errors or "strict"))):
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _roll_for(self, size: int) -> bool:
+        """Count ``size`` more bytes and report whether they belong in a fresh file."""
+        if self.maxBytes <= 0:
+            return False
+        if self._written is None:
+            self._written = os.path.getsize(self.baseFilename) if os.path.isfile(self.baseFilename) else 0
         
-        return super().format(record)
+        if self._written and self._written + size > self.maxBytes:
+            self._written = size  # this record opens the next file
+            return True
+        self._written += size
+        return False
 
-def setup_logging(log_level: str = "INFO", log_to_file: bool = True):
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the queue is full instead of blocking the caller."""
+    
+    def __init__(self, queue):
+        super().__init__(queue)
+        self._dropped = 0  # guarded by the handler lock, which handle() holds around enqueue
+    
+    def enqueue(self, record):
+        try:
+            if self._dropped:
+                # Report the loss as soon as there is room again, ahead of the record that found it
+                self.queue.put_nowait(logging.LogRecord(
+                    __name__, logging.WARNING, __file__, 0, "Dropped %d log records (log queue full)",
+                    (self._dropped,), None
+                ))
+                self._dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._dropped += 1
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    """Queue listener whose stop sentinel waits for room in a bounded queue rather than failing."""
+    
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+def _stop_listener():
+    """Flush queued records through the real handlers, close them and stop the background thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            # A MemoryHandler flushes into its target on close, so close the target after it
+            target = getattr(handler, "target", None)
+            handler.close()
+            if target is not None:
+                target.close()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+def setup_logging(log_level: str = LOG_LEVEL, log_to_file: bool = True):
     """Set up logging configuration for the application."""
+    global _listener
     
-    # Create logs directory if it doesn't exist
+    # Created lazily by the file handler on its first record
     logs_dir = Path("logs")
-    logs_dir.mkdir(exist_ok=True)
+    
+    # None of the formats below print thread, process or task fields, so don't collect them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False  # Python 3.12+; ignored by earlier versions
     
     # Configure root logger
     logger = logging.getLogger()
-    logger.setLevel(getattr(logging, log_level.upper()))
+    level = getattr(logging, log_level.upper())
     
-    # Clear existing handlers
+    # Clear existing handlers, draining any listener from an earlier call first
+    _stop_listener()
     logger.handlers.clear()
+    handlers = []
     
     # Console handler with colors
     console_handler = logging.StreamHandler(sys.stdout)
-    console_formatter = ColoredFormatter(
+    # Colors only help a terminal; pipes, files and NO_COLOR (https://no-color.org) get plain text
+    use_color = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+    if use_color and sys.platform == "win32":
+        # Enable ANSI handling in the Windows console; POSIX terminals take the codes as-is, so no stream wrapping
+        just_fix_windows_console()
+    console_formatter = (ColoredFormatter if use_color else FastFormatter)(
         fmt='%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s',
         datefmt='%H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(logging.INFO)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (if enabled)
     if log_to_file:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_handler = logging.FileHandler(
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        file_handler = RawFileHandler(
             logs_dir / f"customer_care_{timestamp}.log",
             encoding='utf-8'
         )
-        file_formatter = logging.Formatter(
+        file_formatter = FastFormatter(
             fmt='%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
         file_handler.setLevel(logging.DEBUG)
-        logger.addHandler(file_handler)
+        
+        # Hand records to the file in batches; warnings and above go through at once, as the file flushes them
+        memory_handler = logging.handlers.MemoryHandler(
+            capacity=512, flushLevel=logging.WARNING, target=file_handler, flushOnClose=True
+        )
+        memory_handler.setLevel(logging.DEBUG)
+        handlers.append(memory_handler)
+    
+    # Filter at the logger: don't build records that no handler would accept (e.g. DEBUG without a log file)
+    logger.setLevel(max(level, min(handler.level for handler in handlers)))
     
-    # Set specific logger levels
-    logging.getLogger("uvicorn").setLevel(logging.WARNING)
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    logging.getLogger("fastapi").setLevel(logging.WARNING)
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.WARNING)
+    if not log_to_file and logger.level >= logging.WARNING:
+        # Only the occasional warning reaches the console, so a queue and writer thread would cost more than they save
+        logger.addHandler(console_handler)
+    else:
+        # Emit through a queue so logging calls never block on console or disk writes
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _listener = _DrainingQueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        logger.addHandler(DroppingQueueHandler(log_queue))
     
-    # Demo-specific loggers
-    logging.getLogger("agents").setLevel(logging.INFO)
-    logging.getLogger("orchestrator").setLevel(logging.INFO)
-    logging.getLogger("planner").setLevel(logging.INFO)
-    logging.getLogger("tools").setLevel(logging.INFO)
+    # Set specific logger levels in one pass under the logging module lock (reentrant, so getLogger can take it too);
+    # a stricter requested level wins, so WARNING really does silence the demo components' INFO chatter
+    with logging._lock:
+        for name, name_level in _LOGGER_LEVELS.items():
+            logging.getLogger(name).setLevel(max(name_level, level))
     
-    logger.info(f"Logging configured - Level: {log_level}, File logging: {log_to_file}")
+    logger.info("Logging configured - Level: %s, File logging: %s", log_level, log_to_file)
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    """Get a logger instance with the specified name."""
+    """Get a logger instance with the specified name (loggers are never discarded, so memoize them)."""
     return logging.getLogger(name)
\ No newline at end of file